@@ -8,6 +8,7 @@ Handles real-time monitoring, health scoring, risk detection, and automated reme
 """
 
 import json
+import queue
 import threading
 import time
 import signal
@@ -21,7 +22,7 @@ import logging
 import sys
 
 # Import production utilities and configuration
-from config import config, Config
+from config import config, Config, setup_logging
 from utils import (
     APIResponse, InputValidator, ErrorHandler, PerformanceMonitor, 
     cache, rate_limiter, response_handler, input_validator, error_handler
@@ -29,21 +30,14 @@ from utils import (
 
 # Import custom modules
 from ml_decision_engine import MLDecisionEngine
-from kubernetes_manager import KubernetesManager
+from kubernetes_manager import KubernetesManager, nodes_metrics_soa
 from event_manager import EventManager
 from analytics_engine import AnalyticsEngine
 from audit_logger import AuditLogger
 from health_scorer import HealthScorer
 
 # ===================== LOGGING SETUP =====================
-logging.basicConfig(
-    level=config.LOG_LEVEL,
-    format=config.LOG_FORMAT,
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('app.log', mode='a', encoding='utf-8')
-    ]
-)
+setup_logging(config)
 logger = logging.getLogger(__name__)
 
 # ===================== FLASK APP SETUP =====================
@@ -125,6 +119,44 @@ class MonitoringService:
         self.running = False
         self.interval = 3  # Monitor every 3 seconds
         self.history = deque(maxlen=1000)
+        # One single-slot queue per /api/nodes/stream client; each holds the latest tick
+        self._subscribers = set()
+        self._subscribers_lock = threading.Lock()
+    
+    def subscribe(self):
+        """Register a stream client; returns the queue that receives serialized node lists"""
+        updates = queue.Queue(maxsize=1)
+        with self._subscribers_lock:
+            self._subscribers.add(updates)
+        return updates
+    
+    def unsubscribe(self, updates):
+        """Remove a stream client's queue"""
+        with self._subscribers_lock:
+            self._subscribers.discard(updates)
+    
+    def _publish(self, nodes, lock=None):
+        """Push this tick's node list to every stream client, replacing any unread tick
+        (lock: held while serializing when the nodes are shared, mutable state)"""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        
+        if lock is None:
+            payload = json.dumps(nodes)
+        else:
+            with lock:
+                payload = json.dumps(list(nodes))
+        for updates in subscribers:
+            try:
+                updates.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                updates.put_nowait(payload)
+            except queue.Full:
+                pass
     
     def start(self):
         """Start the monitoring service"""
@@ -161,29 +193,30 @@ class MonitoringService:
                     # Demo mode: generate fresh metrics and update persistent demo_nodes
                     nodes_data = self._generate_demo_metrics()
                     # Update the persistent demo_nodes dictionary with new metrics
-                    for node in nodes_data:
-                        if node['node_id'] in demo_nodes:
-                            # Keep taints and other persistent state
-                            demo_nodes[node['node_id']].update({
-                                'cpu_usage': node.get('cpu_usage', 0),
-                                'memory_usage': node.get('memory_usage', 0),
-                                'temperature': node.get('temperature', 0),
-                                'network_latency': node.get('network_latency', 0),
-                                'disk_io': node.get('disk_io', 0),
-                                'status': node.get('status', 'healthy')
-                            })
+                    _ensure_demo_nodes()
+                    with demo_nodes_lock:
+                        for node in nodes_data:
+                            if node['node_id'] in demo_nodes:
+                                # Keep taints and other persistent state
+                                demo_nodes[node['node_id']].update({
+                                    'cpu_usage': node.get('cpu_usage', 0),
+                                    'memory_usage': node.get('memory_usage', 0),
+                                    'temperature': node.get('temperature', 0),
+                                    'network_latency': node.get('network_latency', 0),
+                                    'disk_io': node.get('disk_io', 0),
+                                    'status': node.get('status', 'healthy')
+                                })
                     logger.info(f"[MONITOR] Monitoring: Updated {len(nodes_data)} nodes with fresh metrics")
                 
                 # Track current risks
                 current_risks = 0
                 
-                # Make predictions using ML engine
-                for node_data in nodes_data:
+                # Make predictions using ML engine (one batched model call per cycle)
+                predictions = ml_engine.predict_degradation_batch(nodes_data)
+                
+                for node_data, prediction in zip(nodes_data, predictions):
                     node_id = node_data['node_id']
                     
-                    # Get ML prediction
-                    prediction = ml_engine.predict_degradation(node_data)
-                    
                     # Calculate health score
                     health_score = health_scorer.calculate_overall_health(node_data)
                     
@@ -220,6 +253,12 @@ class MonitoringService:
                 # Update stats counter
                 stats_counters['current_risks'] = current_risks
                 
+                # Stream clients get the same view as /api/nodes
+                if k8s_manager and k8s_manager.available:
+                    self._publish(nodes_data)
+                else:
+                    self._publish(demo_nodes.values(), demo_nodes_lock)
+                
                 time.sleep(self.interval)
             
             except Exception as e:
@@ -405,11 +444,17 @@ monitoring_service = MonitoringService()
 
 # Demo-mode in-memory node state (persist taints/pods during demo)
 demo_nodes = {}
+# Guards mutation of demo_nodes (monitor updates, taint/drain actions) and snapshots of it
+demo_nodes_lock = threading.RLock()
 
 def _ensure_demo_nodes():
     """Populate demo_nodes once and keep state across requests"""
-    if demo_nodes:
-        return
+    with demo_nodes_lock:
+        if not demo_nodes:
+            _populate_demo_nodes()
+
+def _populate_demo_nodes():
+    """Fill demo_nodes from one round of generated metrics (caller holds demo_nodes_lock)"""
     nodes = monitoring_service._generate_demo_metrics()
     for n in nodes:
         demo_nodes[n['node_id']] = {
@@ -549,6 +594,44 @@ def get_nodes():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/nodes/stream', methods=['GET'])
+def stream_nodes():
+    """Server-Sent Events stream of all nodes, one message per monitoring tick"""
+    updates = monitoring_service.subscribe()
+    
+    # Send the current snapshot straight away instead of waiting for the next tick
+    try:
+        if k8s_manager and k8s_manager.available:
+            snapshot = json.dumps(k8s_manager.get_nodes_metrics())
+        else:
+            _ensure_demo_nodes()
+            with demo_nodes_lock:
+                snapshot = json.dumps(list(demo_nodes.values()))
+        updates.put_nowait(snapshot)
+    except queue.Full:
+        pass  # a monitoring tick got there first
+    except Exception as e:
+        logger.error(f"Error fetching nodes for stream: {e}")
+    
+    def generate():
+        try:
+            while True:
+                try:
+                    payload = updates.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {payload}\n\n"
+        finally:
+            monitoring_service.unsubscribe(updates)
+    
+    return app.response_class(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/nodes/<node_id>', methods=['GET'])
 def get_node(node_id):
     """Get specific node details"""
@@ -579,8 +662,7 @@ def get_predictions():
             nodes = monitoring_service._generate_demo_metrics()
         
         predictions = []
-        for node in nodes:
-            pred = ml_engine.predict_degradation(node)
+        for node, pred in zip(nodes, ml_engine.predict_degradation_batch(nodes)):
             predictions.append({
                 'node_id': node['node_id'],
                 'node_name': node['node_name'],
@@ -686,13 +768,12 @@ def get_stats():
         total_eco_score = 0.0
         nodes_with_warnings = 0
         
-        for node in nodes:
-            # Calculate comprehensive health score
-            health_score = health_scorer.calculate_overall_health(node)
-            score = health_score.get('overall_score', 100)
-            
-            # Predict Risk/Eco Score
-            prediction = ml_engine.predict_degradation(node)
+        predictions = ml_engine.predict_degradation_batch(nodes)
+        # Only score and status are needed here, so grade every node at once from columns
+        health = health_scorer.calculate_overall_health_batch(nodes_metrics_soa(nodes))
+        
+        for node, prediction, score, status in zip(nodes, predictions, health['overall_score'].tolist(), health['status']):
+            # Risk/Eco Score from the batched prediction
             eco_score = prediction.get('eco_score', 100)
             total_eco_score += eco_score
             
@@ -701,14 +782,14 @@ def get_stats():
                 nodes_with_warnings += 1
             
             # Count nodes at risk (critical or degraded status)
-            if health_score.get('status') == 'critical' or score < 60:
+            if status == 'critical' or score < 60:
                 risks_detected += 1
                 at_risk_nodes.append(node['node_id'])
             
             # Track health status
-            if health_score.get('status') == 'degraded':
+            if status == 'degraded':
                 degraded_count += 1
-            elif health_score.get('status') == 'healthy':
+            elif status == 'healthy':
                 healthy_count += 1
             
             # Accumulate health scores
@@ -843,9 +924,10 @@ def taint_node(node_id):
             except Exception:
                 k, v, effect = taint, 'true', 'NoSchedule'
 
-            existing = [t for t in node['taints'] if t.get('key') == k]
-            if not existing:
-                node['taints'].append({'key': k, 'value': v or 'true', 'effect': effect})
+            with demo_nodes_lock:
+                existing = [t for t in node['taints'] if t.get('key') == k]
+                if not existing:
+                    node['taints'].append({'key': k, 'value': v or 'true', 'effect': effect})
 
             event_manager.add_event({
                 'type': 'action',
@@ -884,9 +966,10 @@ def remove_taint(node_id):
             if not node:
                 return jsonify({'error': 'Node not found (demo)'}), 404
 
-            before = len(node['taints'])
-            node['taints'] = [t for t in node['taints'] if t.get('key') != key]
-            after = len(node['taints'])
+            with demo_nodes_lock:
+                before = len(node['taints'])
+                node['taints'] = [t for t in node['taints'] if t.get('key') != key]
+                after = len(node['taints'])
 
             event_manager.add_event({
                 'type': 'action',
@@ -926,8 +1009,9 @@ def drain_node(node_id):
             if not node:
                 return jsonify({'error': 'Node not found (demo)'}), 404
 
-            evicted = len(node.get('pods', []))
-            node['pods'] = []
+            with demo_nodes_lock:
+                evicted = len(node.get('pods', []))
+                node['pods'] = []
 
             event_manager.add_event({
                 'type': 'action',
@@ -4,6 +4,7 @@ Centralizes all configuration from environment variables and defaults
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 import logging
 
@@ -37,6 +38,7 @@ class Config:
     # API settings
     API_TIMEOUT = int(os.getenv('API_TIMEOUT', 30))
     MAX_WORKERS = int(os.getenv('MAX_WORKERS', 4))
+    THREADS_PER_WORKER = int(os.getenv('THREADS_PER_WORKER', 8))
     
     # Health check settings
     HEALTH_CHECK_INTERVAL = int(os.getenv('HEALTH_CHECK_INTERVAL', 5))
@@ -67,6 +69,9 @@ class Config:
         if cls.MONITORING_INTERVAL < 1:
             errors.append("MONITORING_INTERVAL must be >= 1")
         
+        if cls.THREADS_PER_WORKER < 1:
+            errors.append("THREADS_PER_WORKER must be >= 1")
+        
         if cls.RISK_THRESHOLD_CRITICAL < 0 or cls.RISK_THRESHOLD_CRITICAL > 100:
             errors.append("RISK_THRESHOLD_CRITICAL must be 0-100")
         
@@ -116,6 +121,18 @@ class TestingConfig(Config):
     MONITORING_INTERVAL = 1
 
 
+def setup_logging(cfg):
+    """Root logging to stdout and app.log (no-op if the root logger is already configured)"""
+    logging.basicConfig(
+        level=cfg.LOG_LEVEL,
+        format=cfg.LOG_FORMAT,
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler('app.log', mode='a', encoding='utf-8')
+        ]
+    )
+
+
 def get_config(env=None):
     """Get configuration object based on environment"""
     if env is None:
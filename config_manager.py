@@ -95,10 +95,16 @@ class ConfigManager:
     def __init__(self, config_file=None):
         self.config_file = config_file or 'config.json'
         self.config = self.DEFAULT_CONFIG.copy()
-        self.load_config()
+        self._loaded = False
+    
+    def _ensure_loaded(self):
+        """Load the config file on first use rather than at construction"""
+        if not self._loaded:
+            self.load_config()
     
     def load_config(self):
         """Load configuration from file if exists"""
+        self._loaded = True
         if os.path.exists(self.config_file):
             try:
                 with open(self.config_file, 'r') as f:
@@ -112,6 +118,7 @@ class ConfigManager:
     
     def save_config(self):
         """Save current configuration to file"""
+        self._ensure_loaded()
         try:
             with open(self.config_file, 'w') as f:
                 json.dump(self.config, f, indent=2)
@@ -121,12 +128,14 @@ class ConfigManager:
     
     def get(self, section, key=None):
         """Get configuration value"""
+        self._ensure_loaded()
         if key is None:
             return self.config.get(section, {})
         return self.config.get(section, {}).get(key)
     
     def set(self, section, key, value):
         """Set configuration value"""
+        self._ensure_loaded()
         if section not in self.config:
             self.config[section] = {}
         self.config[section][key] = value
@@ -134,15 +143,18 @@ class ConfigManager:
     
     def get_all(self):
         """Get entire configuration"""
+        self._ensure_loaded()
         return self.config
     
     def reset_to_defaults(self):
         """Reset to default configuration"""
         self.config = self.DEFAULT_CONFIG.copy()
+        self._loaded = True
         logger.info("Configuration reset to defaults")
     
     def validate(self):
         """Validate configuration"""
+        self._ensure_loaded()
         errors = []
         
         # Validate thresholds
@@ -171,6 +183,7 @@ class ConfigManager:
     
     def export_config(self, format='json'):
         """Export configuration"""
+        self._ensure_loaded()
         if format == 'json':
             return json.dumps(self.config, indent=2)
         elif format == 'dict':
@@ -182,5 +195,9 @@ class ConfigManager:
         return f"ConfigManager({self.config_file})"
 
 
-# Global config instance
-config = ConfigManager()
+def __getattr__(name):
+    """Create the global config instance on first access"""
+    if name == 'config':
+        instance = globals()['config'] = ConfigManager()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,7 +5,9 @@ Tracks and manages all system events for frontend display and analysis
 
 import uuid
 from datetime import datetime
+from types import MappingProxyType
 from collections import deque
+from itertools import islice
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,10 +19,13 @@ class EventManager:
     def __init__(self, max_events=200):
         self.events = deque(maxlen=max_events)
         self.max_events = max_events
+        self._counts_by_type = {'risk': 0, 'action': 0, 'info': 0}
         self.event_stats = {
             'total': 0,
-            'by_type': {'risk': 0, 'action': 0, 'info': 0}
+            'by_type': MappingProxyType(self._counts_by_type)
         }
+        # Live read-only view handed out by get_stats (no per-call copy)
+        self._stats_view = MappingProxyType(self.event_stats)
     
     def add_event(self, event_data):
         """
@@ -46,8 +51,8 @@ class EventManager:
             # Update stats
             self.event_stats['total'] += 1
             event_type = event['type']
-            if event_type in self.event_stats['by_type']:
-                self.event_stats['by_type'][event_type] += 1
+            if event_type in self._counts_by_type:
+                self._counts_by_type[event_type] += 1
             
             logger.info(f"📝 Event: {event['type'].upper()} - {event['title']}")
             
@@ -68,15 +73,16 @@ class EventManager:
         Returns:
             List of events (most recent first)
         """
-        filtered_events = list(self.events)
+        events = self.events
         
         if event_type:
-            filtered_events = [e for e in filtered_events if e['type'] == event_type]
+            events = (e for e in events if e['type'] == event_type)
         
+        # Only materialize the first `limit` events instead of copying the whole deque
         if limit:
-            filtered_events = filtered_events[:limit]
+            return list(islice(events, limit))
         
-        return filtered_events
+        return list(events)
     
     def get_events_by_node(self, node_id):
         """Get all events related to a specific node"""
@@ -93,8 +99,8 @@ class EventManager:
         ]
     
     def get_stats(self):
-        """Get event statistics"""
-        return self.event_stats.copy()
+        """Get event statistics as a read-only live view"""
+        return self._stats_view
     
     def get_event_by_id(self, event_id):
         """Get a specific event by ID"""
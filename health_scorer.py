@@ -4,9 +4,21 @@ Provides detailed health grades and recommendations
 """
 
 import logging
+from bisect import bisect_right
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Lower bound of each letter grade, ascending; _GRADES[i] covers [_GRADE_BOUNDS[i-1], _GRADE_BOUNDS[i])
+_GRADE_BOUNDS = (50, 60, 70, 75, 80, 85, 90, 95)
+_GRADES = ('F', 'D', 'C', 'B-', 'B', 'B+', 'A-', 'A', 'A+')
+_GRADE_BOUNDS_ARR = np.array(_GRADE_BOUNDS, dtype=np.float64)
+_GRADES_ARR = np.array(_GRADES, dtype=object)
+
+# Component score for each band: below 'ok', ok..warning, warning..critical, >= critical
+_COMPONENT_SCORES = np.array([100, 50, 25, 0], dtype=np.float64)
+
 
 class HealthScorer:
     """Calculate comprehensive health scores for nodes"""
@@ -29,6 +41,32 @@ class HealthScorer:
         'disk_io': {'critical': 85, 'warning': 70, 'ok': 40}
     }
     
+    # Issue/recommendation text per metric; only formatted when a threshold is breached
+    _ISSUE_TEMPLATES = {
+        'cpu': 'High CPU usage: {:.1f}%',
+        'memory': 'High memory usage: {:.1f}%',
+        'temperature': 'High temperature: {:.1f}°C',
+        'latency': 'High network latency: {:.1f}ms',
+        'disk_io': 'High disk I/O: {:.1f}%'
+    }
+    
+    _RECOMMENDATIONS = {
+        'cpu': 'Check running processes and consider scaling',
+        'memory': 'Review container limits and optimize applications',
+        'temperature': 'Improve cooling or check for thermal issues',
+        'latency': 'Check network connectivity and bandwidth',
+        'disk_io': 'Monitor disk operations and consider SSD upgrade'
+    }
+    
+    # Column in a structure-of-arrays metrics dict feeding each component
+    SOA_COLUMNS = {
+        'cpu': 'cpu_usage',
+        'memory': 'memory_usage',
+        'temperature': 'temperature',
+        'latency': 'network_latency',
+        'disk_io': 'disk_io'
+    }
+    
     @classmethod
     def calculate_component_health(cls, metric_name, value):
         """Calculate health score for a single metric (0-100)"""
@@ -66,36 +104,36 @@ class HealthScorer:
         cpu = node_data.get('cpu_usage', 0)
         scores['cpu'] = cls.calculate_component_health('cpu', cpu)
         if cpu > 80:
-            issues.append(f'High CPU usage: {cpu:.1f}%')
-            recommendations.append('Check running processes and consider scaling')
+            issues.append(cls._ISSUE_TEMPLATES['cpu'].format(cpu))
+            recommendations.append(cls._RECOMMENDATIONS['cpu'])
         
         # Memory score
         memory = node_data.get('memory_usage', 0)
         scores['memory'] = cls.calculate_component_health('memory', memory)
         if memory > 85:
-            issues.append(f'High memory usage: {memory:.1f}%')
-            recommendations.append('Review container limits and optimize applications')
+            issues.append(cls._ISSUE_TEMPLATES['memory'].format(memory))
+            recommendations.append(cls._RECOMMENDATIONS['memory'])
         
         # Temperature score
         temp = node_data.get('temperature', 50)
         scores['temperature'] = cls.calculate_component_health('temperature', temp)
         if temp > 75:
-            issues.append(f'High temperature: {temp:.1f}°C')
-            recommendations.append('Improve cooling or check for thermal issues')
+            issues.append(cls._ISSUE_TEMPLATES['temperature'].format(temp))
+            recommendations.append(cls._RECOMMENDATIONS['temperature'])
         
         # Network latency score
         latency = node_data.get('network_latency', 0)
         scores['latency'] = cls.calculate_component_health('latency', latency)
         if latency > 30:
-            issues.append(f'High network latency: {latency:.1f}ms')
-            recommendations.append('Check network connectivity and bandwidth')
+            issues.append(cls._ISSUE_TEMPLATES['latency'].format(latency))
+            recommendations.append(cls._RECOMMENDATIONS['latency'])
         
         # Disk I/O score
         disk = node_data.get('disk_io', 0)
         scores['disk_io'] = cls.calculate_component_health('disk_io', disk)
         if disk > 75:
-            issues.append(f'High disk I/O: {disk:.1f}%')
-            recommendations.append('Monitor disk operations and consider SSD upgrade')
+            issues.append(cls._ISSUE_TEMPLATES['disk_io'].format(disk))
+            recommendations.append(cls._RECOMMENDATIONS['disk_io'])
         
         # Calculate weighted overall score
         overall = sum(scores[key] * cls.WEIGHTS[key] for key in scores)
@@ -122,27 +160,45 @@ class HealthScorer:
             'taints': len(node_data.get('taints', []))
         }
     
+    @classmethod
+    def calculate_overall_health_batch(cls, metrics):
+        """
+        Score many nodes at once from column arrays
+        
+        Args:
+            metrics: Dict of equal-length arrays keyed by SOA_COLUMNS values
+                     (e.g. kubernetes_manager.nodes_metrics_soa(nodes))
+        
+        Returns:
+            {
+                'overall_score': float array,
+                'grade': object array of letter grades,
+                'status': object array of 'healthy'/'degraded'/'critical'
+            }
+        """
+        overall = None
+        for component, column in cls.SOA_COLUMNS.items():
+            values = np.asarray(metrics[column], dtype=np.float64)
+            t = cls.THRESHOLDS[component]
+            bounds = (t['ok'], t['warning'], t['critical'])
+            component_scores = _COMPONENT_SCORES[np.searchsorted(bounds, values, side='right')]
+            weighted = component_scores * cls.WEIGHTS[component]
+            overall = weighted if overall is None else overall + weighted
+        
+        grades = np.take(_GRADES_ARR, np.searchsorted(_GRADE_BOUNDS_ARR, overall, side='right'))
+        status = np.where(overall >= 80, 'healthy',
+                          np.where(overall >= 50, 'degraded', 'critical')).astype(object)
+        
+        return {
+            'overall_score': np.round(overall, 1),
+            'grade': grades,
+            'status': status
+        }
+    
     @staticmethod
     def _score_to_grade(score):
         """Convert numeric score to letter grade"""
-        if score >= 95:
-            return 'A+'
-        elif score >= 90:
-            return 'A'
-        elif score >= 85:
-            return 'A-'
-        elif score >= 80:
-            return 'B+'
-        elif score >= 75:
-            return 'B'
-        elif score >= 70:
-            return 'B-'
-        elif score >= 60:
-            return 'C'
-        elif score >= 50:
-            return 'D'
-        else:
-            return 'F'
+        return _GRADES[bisect_right(_GRADE_BOUNDS, score)]
     
     @staticmethod
     def get_sla_status(overall_score):
@@ -0,0 +1,28 @@
+"""
+Shared HTTP session and SSE reader for the local test and verification scripts
+"""
+
+import json
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pooled keep-alive connections with light retries, shared by every probe in a script
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.1)))
+
+STREAM_URL = 'http://127.0.0.1:5000/api/nodes/stream'
+
+
+def node_updates(deadline=30):
+    """Yield (seconds since connect, nodes) for each monitoring tick pushed over SSE"""
+    start = time.monotonic()
+    with SESSION.get(STREAM_URL, stream=True, timeout=(2, deadline)) as response:
+        response.raise_for_status()
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if time.monotonic() - start > deadline:
+                raise TimeoutError(f"No monitoring update within {deadline}s")
+            if line and line.startswith('data: '):
+                yield time.monotonic() - start, json.loads(line[6:])
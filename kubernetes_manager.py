@@ -3,25 +3,68 @@ Kubernetes Integration Manager
 Handles cluster communication, node management, and workload orchestration
 """
 
+import heapq
 import logging
 import os
+import re
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 # Import kubernetes with error handling to prevent startup failure
 try:
-    from kubernetes import client, config
+    from kubernetes import client, config, watch
     from kubernetes.client.rest import ApiException
     KUBERNETES_AVAILABLE = True
 except ImportError as e:
     logger.warning(f"⚠️ Kubernetes not available: {e}")
     client = None
     config = None
+    watch = None
     ApiException = Exception
     KUBERNETES_AVAILABLE = False
 
 import random
 
+import numpy as np
+
+# "key[=value]:effect", e.g. "degradation=true:NoSchedule"
+_TAINT_RE = re.compile(r'^([^=:]+)(?:=([^:]+))?:(.+)$')
+
+# Numeric columns emitted by nodes_metrics_soa, with the default for a missing metric
+# (the same defaults HealthScorer.calculate_overall_health uses)
+SOA_METRICS = {
+    'cpu_usage': 0,
+    'memory_usage': 0,
+    'temperature': 50,
+    'network_latency': 0,
+    'disk_io': 0
+}
+
+
+def nodes_metrics_soa(nodes_data):
+    """
+    Convert a list of node metric dicts to columns (structure of arrays)
+    
+    Returns:
+        Dict with 'node_id' (list), 'pod_count' and one float64 numpy array
+        per SOA_METRICS entry, all aligned by index
+    """
+    n = len(nodes_data)
+    soa = {name: np.empty(n, dtype=np.float64) for name in SOA_METRICS}
+    soa['pod_count'] = np.empty(n, dtype=np.int32)
+    node_ids = []
+    
+    for i, node in enumerate(nodes_data):
+        node_ids.append(node['node_id'])
+        for name, default in SOA_METRICS.items():
+            soa[name][i] = node.get(name, default)
+        soa['pod_count'][i] = len(node.get('pods', []))
+    
+    soa['node_id'] = node_ids
+    return soa
+
 
 class KubernetesManager:
     """
@@ -29,9 +72,37 @@ class KubernetesManager:
     Gathers metrics, applies taints, drains nodes, and migrates workloads
     """
     
+    # Seconds a list_node/read_node response is reused before hitting the apiserver again
+    NODE_CACHE_TTL = 2.0
+    
+    # Seconds to wait before re-establishing a dropped watch stream
+    WATCH_RETRY_DELAY = 5
+    
+    # Seconds before the migration-target heap is rebuilt from scratch
+    CANDIDATE_INDEX_TTL = 30
+    
     def __init__(self):
         """Initialize Kubernetes client"""
         self.available = False
+        self._node_list_cache = (0.0, None)
+        self._node_read_cache = {}
+        
+        # Informer-style local mirror of cluster state, fed by watch streams
+        self._node_cache = {}
+        self._pods_by_node = {}
+        self._pod_locations = {}
+        self._cache_lock = threading.Lock()
+        self._nodes_synced = threading.Event()
+        self._pods_synced = threading.Event()
+        
+        # Min-heap of (pod_count, node_name) migration targets with lazy deletion:
+        # an entry is live only if its count matches _candidate_counts and the
+        # node is not in _tainted_set
+        self._candidate_heap = []
+        self._candidate_counts = {}
+        self._tainted_set = set()
+        self._candidate_built_at = 0.0
+        self._candidate_lock = threading.Lock()
         
         # If kubernetes library couldn't be imported, skip initialization
         if not KUBERNETES_AVAILABLE or config is None:
@@ -69,6 +140,7 @@ class KubernetesManager:
                 self.v1 = client.CoreV1Api()
                 self.apps_v1 = client.AppsV1Api()
                 self.batch_v1 = client.BatchV1Api()
+                self._start_watchers()
                 logger.info("✓ Kubernetes manager initialized successfully")
             except Exception as e:
                 logger.warning(f"Could not initialize K8s clients: {e}")
@@ -80,6 +152,90 @@ class KubernetesManager:
             self.batch_v1 = None
             logger.info("Kubernetes manager in DEMO MODE")
     
+    def _start_watchers(self):
+        """Start background watch threads that keep the node/pod mirror current"""
+        for target, name in ((self._watch_nodes, 'k8s-node-watch'),
+                             (self._watch_pods, 'k8s-pod-watch')):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+    
+    def _watch_nodes(self):
+        """List nodes once, then apply watch events incrementally"""
+        while True:
+            try:
+                nodes = self.v1.list_node()
+                with self._cache_lock:
+                    self._node_cache = {n.metadata.name: n for n in nodes.items}
+                self._nodes_synced.set()
+                
+                w = watch.Watch()
+                for ev in w.stream(self.v1.list_node,
+                                   resource_version=nodes.metadata.resource_version,
+                                   timeout_seconds=0):
+                    node = ev['object']
+                    with self._cache_lock:
+                        if ev['type'] == 'DELETED':
+                            self._node_cache.pop(node.metadata.name, None)
+                        else:
+                            self._node_cache[node.metadata.name] = node
+            except Exception as e:
+                logger.warning(f"Node watch interrupted, re-listing: {e}")
+            
+            self._nodes_synced.clear()
+            time.sleep(self.WATCH_RETRY_DELAY)
+    
+    def _watch_pods(self):
+        """List pods once, then apply watch events incrementally, indexed by node"""
+        while True:
+            try:
+                pods = self.v1.list_pod_for_all_namespaces()
+                with self._cache_lock:
+                    self._pods_by_node = {}
+                    self._pod_locations = {}
+                    for pod in pods.items:
+                        self._store_pod(pod)
+                self._pods_synced.set()
+                
+                w = watch.Watch()
+                for ev in w.stream(self.v1.list_pod_for_all_namespaces,
+                                   resource_version=pods.metadata.resource_version,
+                                   timeout_seconds=0):
+                    pod = ev['object']
+                    with self._cache_lock:
+                        if ev['type'] == 'DELETED':
+                            self._forget_pod(pod)
+                        else:
+                            self._store_pod(pod)
+            except Exception as e:
+                logger.warning(f"Pod watch interrupted, re-listing: {e}")
+            
+            self._pods_synced.clear()
+            time.sleep(self.WATCH_RETRY_DELAY)
+    
+    def _store_pod(self, pod):
+        """Index a pod under its node (caller holds _cache_lock)"""
+        self._forget_pod(pod)
+        node_name = pod.spec.node_name
+        if not node_name:
+            return  # Not scheduled yet
+        key = (pod.metadata.namespace, pod.metadata.name)
+        self._pods_by_node.setdefault(node_name, {})[key] = pod
+        self._pod_locations[key] = node_name
+    
+    def _forget_pod(self, pod):
+        """Remove a pod from the node index (caller holds _cache_lock)"""
+        key = (pod.metadata.namespace, pod.metadata.name)
+        node_name = self._pod_locations.pop(key, None)
+        if node_name is not None:
+            self._pods_by_node.get(node_name, {}).pop(key, None)
+    
+    def _list_nodes(self):
+        """Return node objects from the watch mirror, or the apiserver until it has synced"""
+        if self._nodes_synced.is_set():
+            with self._cache_lock:
+                return list(self._node_cache.values())
+        return self._fetch_nodes().items
+    
     def get_nodes_metrics(self):
         """Get all nodes with their current metrics"""
         # In demo mode (no K8s cluster), return empty list
@@ -88,10 +244,10 @@ class KubernetesManager:
             return []
         
         try:
-            nodes = self.v1.list_node()
+            nodes = self._list_nodes()
             nodes_data = []
             
-            for node in nodes.items:
+            for node in nodes:
                 node_data = {
                     'node_id': node.metadata.name,
                     'node_name': node.metadata.name,
@@ -126,7 +282,7 @@ class KubernetesManager:
     def get_node_details(self, node_id):
         """Get detailed information about a specific node"""
         try:
-            node = self.v1.read_node(node_id)
+            node = self._fetch_node(node_id)
             
             node_data = {
                 'node_id': node.metadata.name,
@@ -149,8 +305,48 @@ class KubernetesManager:
             logger.error(f"Error fetching node {node_id}: {e}")
             raise
     
+    def _fetch_nodes(self):
+        """List cluster nodes, reusing the last response for NODE_CACHE_TTL seconds"""
+        ts, nodes = self._node_list_cache
+        if nodes is not None and time.monotonic() - ts < self.NODE_CACHE_TTL:
+            return nodes
+        
+        nodes = self.v1.list_node()
+        self._node_list_cache = (time.monotonic(), nodes)
+        return nodes
+    
+    def _fetch_node(self, node_name):
+        """Read a single node, reusing the last response for NODE_CACHE_TTL seconds"""
+        ts, node = self._node_read_cache.get(node_name, (0.0, None))
+        if node is not None and time.monotonic() - ts < self.NODE_CACHE_TTL:
+            return node
+        
+        node = self.v1.read_node(node_name)
+        self._node_read_cache[node_name] = (time.monotonic(), node)
+        return node
+    
+    def _invalidate_node_cache(self, node_name=None):
+        """Drop cached node responses after a mutating operation"""
+        self._node_list_cache = (0.0, None)
+        if node_name is None:
+            self._node_read_cache.clear()
+        else:
+            self._node_read_cache.pop(node_name, None)
+    
     def _get_node_pods(self, node_name):
         """Get all pods running on a specific node"""
+        if self._pods_synced.is_set():
+            with self._cache_lock:
+                pods = list(self._pods_by_node.get(node_name, {}).values())
+            return [
+                {
+                    'name': pod.metadata.name,
+                    'namespace': pod.metadata.namespace,
+                    'status': pod.status.phase
+                }
+                for pod in pods
+            ]
+        
         try:
             pods = self.v1.list_pod_for_all_namespaces(
                 field_selector=f'spec.nodeName={node_name}'
@@ -187,10 +383,10 @@ class KubernetesManager:
         taint_spec format: "key=value:effect" (e.g., "degradation=true:NoSchedule")
         """
         try:
-            key, effect = taint_spec.split(':')
-            key_val = key.split('=')
-            key_name = key_val[0]
-            key_value = key_val[1] if len(key_val) > 1 else 'true'
+            m = _TAINT_RE.match(taint_spec)
+            if not m:
+                raise ValueError(f"Invalid taint spec '{taint_spec}', expected key=value:effect")
+            key_name, key_value, effect = m.group(1), m.group(2) or 'true', m.group(3)
             
             node = self.v1.read_node(node_name)
             
@@ -209,6 +405,8 @@ class KubernetesManager:
             
             # Update node
             self.v1.patch_node(node_name, node)
+            self._invalidate_node_cache(node_name)
+            self._set_candidate_tainted(node_name, True)
             logger.info(f"✓ Applied taint '{taint_spec}' to node {node_name}")
             
             return True
@@ -227,6 +425,8 @@ class KubernetesManager:
                     t for t in node.spec.taints if t.key != taint_key
                 ]
                 self.v1.patch_node(node_name, node)
+                self._invalidate_node_cache(node_name)
+                self._set_candidate_tainted(node_name, bool(node.spec.taints))
                 logger.info(f"✓ Removed taint '{taint_key}' from node {node_name}")
             
             return True
@@ -246,6 +446,7 @@ class KubernetesManager:
                 node.metadata.labels = labels
             
             self.v1.patch_node(node_name, node)
+            self._invalidate_node_cache(node_name)
             logger.info(f"✓ Applied labels to node {node_name}")
             
             return True
@@ -257,38 +458,87 @@ class KubernetesManager:
     def find_best_target_node(self, source_node_id):
         """Find the best healthy node to migrate workloads to"""
         try:
-            nodes = self.v1.list_node()
-            
-            best_node = None
-            best_score = float('inf')
-            
-            for node in nodes.items:
-                node_name = node.metadata.name
+            with self._candidate_lock:
+                if time.monotonic() - self._candidate_built_at > self.CANDIDATE_INDEX_TTL:
+                    self._rebuild_candidate_heap()
                 
-                # Skip source node and tainted nodes
-                if node_name == source_node_id:
-                    continue
+                heap = self._candidate_heap
+                skipped = []
+                best = None
                 
-                if node.spec.taints:
-                    continue  # Skip tainted nodes
+                while heap:
+                    entry = heapq.heappop(heap)
+                    pod_count, node_name = entry
+                    
+                    # Drop entries superseded by a taint or a newer pod count
+                    if node_name in self._tainted_set or self._candidate_counts.get(node_name) != pod_count:
+                        continue
+                    
+                    # Skip source node but keep it indexed
+                    if node_name == source_node_id:
+                        skipped.append(entry)
+                        continue
+                    
+                    best = entry
+                    break
                 
-                # Calculate fitness score (lower is better)
-                pods = len(self._get_node_pods(node_name))
-                score = pods
+                for entry in skipped:
+                    heapq.heappush(heap, entry)
                 
-                if score < best_score:
-                    best_score = score
-                    best_node = {
-                        'name': node_name,
-                        'pod_count': pods
-                    }
-            
-            return best_node
+                if best is None:
+                    return None
+                
+                heapq.heappush(heap, best)
+                return {
+                    'name': best[1],
+                    'pod_count': best[0]
+                }
         
         except Exception as e:
             logger.error(f"Error finding target node: {e}")
             return None
     
+    def _rebuild_candidate_heap(self):
+        """Rebuild the migration-target heap (caller holds _candidate_lock)"""
+        heap = []
+        counts = {}
+        tainted = set()
+        
+        for node in self._list_nodes():
+            node_name = node.metadata.name
+            if node.spec.taints:
+                tainted.add(node_name)
+                continue
+            
+            # Fitness score is the pod count (lower is better)
+            pod_count = len(self._get_node_pods(node_name))
+            counts[node_name] = pod_count
+            heap.append((pod_count, node_name))
+        
+        heapq.heapify(heap)
+        self._candidate_heap = heap
+        self._candidate_counts = counts
+        self._tainted_set = tainted
+        self._candidate_built_at = time.monotonic()
+    
+    def _set_candidate_tainted(self, node_name, tainted):
+        """Update a node's eligibility as a migration target after a taint change"""
+        with self._candidate_lock:
+            if tainted:
+                self._tainted_set.add(node_name)
+                return
+            self._tainted_set.discard(node_name)
+        self._refresh_candidate(node_name)
+    
+    def _refresh_candidate(self, node_name):
+        """Re-index a node's pod count, leaving the old heap entry to be skipped lazily"""
+        with self._candidate_lock:
+            if not self._candidate_built_at or node_name in self._tainted_set:
+                return
+            pod_count = len(self._get_node_pods(node_name))
+            self._candidate_counts[node_name] = pod_count
+            heapq.heappush(self._candidate_heap, (pod_count, node_name))
+    
     def drain_node(self, node_name, grace_period=30, slo_aware=True):
         """
         Drain a node by evicting pods gracefully
@@ -345,6 +595,8 @@ class KubernetesManager:
                 except ApiException as e:
                     logger.warning(f"Could not evict pod {pod.metadata.name}: {e}")
             
+            self._invalidate_node_cache(node_name)
+            self._refresh_candidate(node_name)
             logger.info(f"✓ Drained {evicted_count} pods from {node_name}")
             return evicted_count
         
@@ -3,13 +3,114 @@ ML/AI Decision Engine for Predictive Degradation Detection
 Uses Gradient Boosting for anomaly-based risk scoring
 """
 
+import math
+import os
+import tempfile
+import threading
+import warnings
+from functools import lru_cache
 import numpy as np
-from sklearn.ensemble import GradientBoostingClassifier
+from joblib import Parallel, delayed
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 from sklearn.preprocessing import StandardScaler
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Normalized features are scored as int8(x * QUANT_SCALE); metric bins land on exact integers
+QUANT_SCALE = 100
+
+# Batches larger than this are split into row chunks scored on a thread pool
+PARALLEL_BATCH_THRESHOLD = 64
+
+# Treelite is optional: compiles the trained ensemble to native code for faster inference
+try:
+    import treelite
+    import treelite.sklearn
+    import treelite_runtime
+    TREELITE_AVAILABLE = True
+    # Treelite 3.9 (pinned <4) warns on every export, Predictor and DMatrix call; installed once
+    # here rather than per call, since catch_warnings() is not thread-safe and predictions run threaded
+    warnings.filterwarnings(
+        'ignore',
+        message=r'.* is deprecated and scheduled for removal in Treelite 4\.0',
+        category=UserWarning
+    )
+except ImportError:
+    treelite = None
+    treelite_runtime = None
+    TREELITE_AVAILABLE = False
+
+# Numba is optional: JIT-compiles the rule-based scorer; without it the scorer runs as plain Python
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Pass-through used when numba is not installed"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _fast_risk(cpu, mem, temp, lat, disk, pods):
+    """Rule-based risk score from normalized features: sigmoid over a weighted sum"""
+    s = 0.18 * cpu + 0.18 * mem + 0.15 * temp + 0.12 * lat + 0.17 * disk + 0.10 * pods
+    return 1.0 / (1.0 + math.exp(-(s - 0.65) * 12))
+
+
+@njit(cache=True)
+def _fast_risk_batch(features):
+    """Apply _fast_risk to each row of an (N, 6) normalized feature matrix"""
+    out = np.empty(features.shape[0])
+    for i in range(features.shape[0]):
+        out[i] = _fast_risk(features[i, 0], features[i, 1], features[i, 2],
+                            features[i, 3], features[i, 4], features[i, 5])
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _fast_risk_batch_parallel(features):
+    """_fast_risk_batch with rows spread over numba's thread pool, for large batches"""
+    out = np.empty(features.shape[0])
+    for i in prange(features.shape[0]):
+        out[i] = _fast_risk(features[i, 0], features[i, 1], features[i, 2],
+                            features[i, 3], features[i, 4], features[i, 5])
+    return out
+
+
+# Risk-factor label templates, bound once so formatting skips re-parsing the format spec
+_FMT_CPU = 'High CPU ({:.1f}%)'.format
+_FMT_MEMORY = 'Memory Pressure ({:.1f}%)'.format
+_FMT_TEMPERATURE = 'High Temperature ({:.1f}°C)'.format
+_FMT_LATENCY = 'Network Latency ({:.1f}ms)'.format
+_FMT_DISK = 'High Disk I/O ({:.1f}%)'.format
+_FMT_PODS = 'High Pod Density ({} pods)'.format
+
+
+@lru_cache(maxsize=4096)
+def _risk_factor_labels(cpu, mem, temp, latency, disk, pods):
+    """Labels for the triggered factors; each argument is the rounded value, or None if not triggered"""
+    factors = []
+    if cpu is not None:
+        factors.append(_FMT_CPU(cpu))
+    if mem is not None:
+        factors.append(_FMT_MEMORY(mem))
+    if temp is not None:
+        factors.append(_FMT_TEMPERATURE(temp))
+    if latency is not None:
+        factors.append(_FMT_LATENCY(latency))
+    if disk is not None:
+        factors.append(_FMT_DISK(disk))
+    if pods is not None:
+        factors.append(_FMT_PODS(pods))
+    return tuple(factors)
+
 
 class MLDecisionEngine:
     """
@@ -19,46 +120,156 @@ class MLDecisionEngine:
     
     def __init__(self):
         self.risk_threshold = 0.65  # Risk score threshold
+        self._use_ml = True  # False scores with the rule engine instead of the trained model
         self.model = self._initialize_model()
         self.scaler = StandardScaler()
         self.feature_names = [
             'cpu_usage', 'memory_usage', 'temperature',
             'network_latency', 'disk_io', 'pod_count'
         ]
+        self._predictor = None
+        self._model_dir = None  # TemporaryDirectory holding the compiled library while _predictor uses it
+        self._flat = None
+        # Per-thread feature scratch reused by single-node and batch scoring
+        self._local = threading.local()
+        # Permutation importance is computed on first request for the current fit
+        self._importance_lock = threading.Lock()
+        self._importance_data = None
+        self._feature_importances = None
+        # Memoized risk score per quantized (1-unit bin) feature tuple
+        self._cached_score = lru_cache(maxsize=4096)(self._score_bins)
         self._train_initial_model()
+        self._compile_model()
         logger.info("[OK] ML Decision Engine initialized")
     
     def _initialize_model(self):
         """Initialize the ML model"""
-        return GradientBoostingClassifier(
-            n_estimators=50,
+        return HistGradientBoostingClassifier(
+            max_iter=50,
             learning_rate=0.1,
             max_depth=5,
             random_state=42,
+            early_stopping=False,  # No validation split during training
             verbose=0
         )
     
     def _train_initial_model(self):
         """Train model with synthetic data for demo purposes"""
         # Generate synthetic training data
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         
         # Healthy nodes (label=0)
-        healthy = np.random.uniform(20, 60, (100, 6))
+        healthy = rng.uniform(20, 60, (100, 6))
         healthy_labels = np.zeros(100)
         
         # Degraded nodes (label=1) 
-        degraded = np.random.uniform(70, 95, (100, 6))
+        degraded = rng.uniform(70, 95, (100, 6))
         degraded_labels = np.ones(100)
         
-        X_train = np.vstack([healthy, degraded])
+        X_train = np.vstack([healthy, degraded]).astype(np.float32)
         y_train = np.hstack([healthy_labels, degraded_labels])
         
         # Train model
         self.model.fit(X_train, y_train)
+        self._reset_feature_importance(X_train, y_train)
         
         logger.info("[OK] ML model trained on synthetic data")
     
+    @property
+    def use_ml(self):
+        """Whether risk scores come from the trained model (True) or the rule engine (False)"""
+        return self._use_ml
+    
+    @use_ml.setter
+    def use_ml(self, value):
+        self._use_ml = bool(value)
+        self._cached_score.cache_clear()
+    
+    def _compile_model(self):
+        """Compile the trained model with Treelite; fall back to sklearn on any failure"""
+        self._predictor = None
+        old_dir, self._model_dir = self._model_dir, None
+        self._cached_score.cache_clear()
+        self._flat = self._flatten_model()
+        
+        try:
+            if not TREELITE_AVAILABLE:
+                return
+            
+            model_dir = tempfile.TemporaryDirectory(prefix='risk_model_', ignore_cleanup_errors=True)
+            try:
+                libpath = os.path.join(model_dir.name, 'risk.so')
+                tl_model = treelite.sklearn.import_model(self.model)
+                tl_model.export_lib(toolchain='gcc', libpath=libpath,
+                                    params={'parallel_comp': 8}, verbose=False)
+                self._predictor = treelite_runtime.Predictor(libpath, verbose=False)
+                self._model_dir = model_dir
+                logger.info("[OK] ML model compiled with Treelite")
+            except Exception as e:
+                logger.warning(f"Treelite compilation failed, using sklearn inference: {e}")
+                self._predictor = None
+                model_dir.cleanup()
+        finally:
+            # The previous predictor has been replaced; remove its library
+            if old_dir is not None:
+                old_dir.cleanup()
+    
+    def _flatten_model(self):
+        """Pack the boosted trees into flat (n_trees, max_nodes) arrays for vectorized inference"""
+        try:
+            trees = [predictors[0].nodes for predictors in self.model._predictors]
+            n_trees = len(trees)
+            max_nodes = max(len(nodes) for nodes in trees)
+            feature = np.zeros((n_trees, max_nodes), dtype=np.int16)
+            threshold = np.zeros((n_trees, max_nodes), dtype=np.float64)
+            left = np.zeros((n_trees, max_nodes), dtype=np.int32)
+            right = np.zeros((n_trees, max_nodes), dtype=np.int32)
+            is_leaf = np.ones((n_trees, max_nodes), dtype=bool)
+            value = np.zeros((n_trees, max_nodes))
+            for t, nodes in enumerate(trees):
+                n = len(nodes)
+                feature[t, :n] = nodes['feature_idx']
+                threshold[t, :n] = nodes['num_threshold']
+                left[t, :n] = nodes['left']
+                right[t, :n] = nodes['right']
+                is_leaf[t, :n] = nodes['is_leaf']
+                value[t, :n] = nodes['value']
+            return {
+                'feature': feature, 'threshold': threshold, 'left': left, 'right': right,
+                'is_leaf': is_leaf, 'value': value,
+                # x <= thr  <=>  int(x * scale) <= floor(thr * scale) for integer-valued x * scale;
+                # saturating at the int8 range keeps the comparison exact for in-range inputs
+                'threshold_q': np.clip(np.floor(threshold * QUANT_SCALE + 1e-6), -127, 127).astype(np.int8),
+                'baseline': float(np.ravel(self.model._baseline_prediction)[0]),
+                'depth': int(max(nodes['depth'].max() for nodes in trees))
+            }
+        except Exception as e:
+            logger.warning(f"Flat model layout unavailable: {e}")
+            return None
+    
+    def _walk_trees(self, x, threshold):
+        """Descend every tree for every row at once (max_depth steps); returns P(degraded)"""
+        flat = self._flat
+        n_trees = flat['feature'].shape[0]
+        trees = np.arange(n_trees)
+        rows = np.arange(len(x))[:, None]
+        idx = np.zeros((len(x), n_trees), dtype=np.int32)
+        for _ in range(flat['depth']):
+            go_left = x[rows, flat['feature'][trees, idx]] <= threshold[trees, idx]
+            child = np.where(go_left, flat['left'][trees, idx], flat['right'][trees, idx])
+            idx = np.where(flat['is_leaf'][trees, idx], idx, child)
+        
+        raw = flat['baseline'] + flat['value'][trees, idx].sum(axis=1)
+        return 1.0 / (1.0 + np.exp(-raw))
+    
+    def _flat_risk_scores(self, features):
+        """Score on the flat layout, using int8 compares when every row is exactly representable"""
+        scaled = features * QUANT_SCALE
+        xq = np.rint(scaled)
+        if np.all(np.abs(scaled - xq) <= 1e-6) and np.all(np.abs(xq) <= 127):
+            return self._walk_trees(xq.astype(np.int8), self._flat['threshold_q'])
+        return self._walk_trees(features, self._flat['threshold'])
+    
     def predict_degradation(self, node_data):
         """
         Predict if a node is at risk of degradation
@@ -70,99 +281,171 @@ class MLDecisionEngine:
             Dict with prediction, risk_score, and risk_factors
         """
         try:
-            # Extract features
-            features = self._extract_features(node_data)
-            
-            # Make prediction
-            risk_score = self._calculate_risk_score(features)
+            # Quantize metrics so near-identical ticks hit the score cache
+            risk_score = self._cached_score(
+                int(node_data.get('cpu_usage', 0)),
+                int(node_data.get('memory_usage', 0)),
+                int(node_data.get('temperature', 50)),
+                int(node_data.get('network_latency', 0)),
+                int(node_data.get('disk_io', 0)),
+                len(node_data.get('pods', []))
+            )
             
-            # Identify specific risk factors
-            risk_factors = self._identify_risk_factors(node_data, risk_score)
-            
-            # Decision
-            is_at_risk = risk_score > self.risk_threshold
-            
-            # Eco Score & Forecasting Additions
-            eco_score, eco_issues = self.calculate_eco_score(node_data)
-            forecast = self.forecast_capacity(node_data)
-            
-            return {
-                'is_at_risk': is_at_risk,
-                'risk_score': risk_score,
-                'risk_factors': risk_factors,
-                'confidence': min(100, risk_score * 100 / 0.5),  # Normalize to 0-100
-                'recommendation': self._get_recommendation(risk_score, risk_factors),
-                'eco_score': eco_score,
-                'eco_issues': eco_issues,
-                'forecast': forecast
-            }
+            return self._build_prediction(node_data, risk_score)
         
         except Exception as e:
             logger.error(f"Error in degradation prediction: {e}")
-            return {
-                'is_at_risk': False,
-                'risk_score': 0.0,
-                'risk_factors': ['prediction_error'],
-                'confidence': 0,
-                'recommendation': 'Unable to predict - Error in ML pipeline',
-                'eco_score': 100,
-                'eco_issues': [],
-                'forecast': {'status': 'Unknown'}
-            }
+            return self._error_prediction()
     
-    def _extract_features(self, node_data):
-        """Extract and normalize features from node data"""
-        features = [
-            node_data.get('cpu_usage', 0) / 100,
-            node_data.get('memory_usage', 0) / 100,
-            node_data.get('temperature', 50) / 100,
-            node_data.get('network_latency', 0) / 50,
-            node_data.get('disk_io', 0) / 100,
-            len(node_data.get('pods', [])) / 20  # Normalized pod count
-        ]
-        return np.array([features])
+    def predict_degradation_batch(self, nodes_data):
+        """
+        Predict degradation risk for many nodes with a single model call
+        
+        Args:
+            nodes_data: List of dicts with node metrics
+        
+        Returns:
+            List of prediction dicts, in the same order as nodes_data
+        """
+        if not nodes_data:
+            return []
+        
+        try:
+            features = self._extract_features_batch(nodes_data)
+            risk_scores = self._calculate_risk_scores(features)
+            
+            return [
+                self._build_prediction(node_data, float(risk_score))
+                for node_data, risk_score in zip(nodes_data, risk_scores)
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error in batch degradation prediction: {e}")
+            return [self._error_prediction() for _ in nodes_data]
+    
+    def _build_prediction(self, node_data, risk_score):
+        """Assemble the prediction dict for one node from its risk score"""
+        # Identify specific risk factors
+        risk_factors = self._identify_risk_factors(node_data, risk_score)
+        
+        # Decision
+        is_at_risk = risk_score > self.risk_threshold
+        
+        # Eco Score & Forecasting Additions
+        eco_score, eco_issues = self.calculate_eco_score(node_data)
+        forecast = self.forecast_capacity(node_data)
+        
+        return {
+            'is_at_risk': is_at_risk,
+            'risk_score': risk_score,
+            'risk_factors': risk_factors,
+            'confidence': min(100, risk_score * 100 / 0.5),  # Normalize to 0-100
+            'recommendation': self._get_recommendation(risk_score, risk_factors),
+            'eco_score': eco_score,
+            'eco_issues': eco_issues,
+            'forecast': forecast
+        }
+    
+    @staticmethod
+    def _error_prediction():
+        """Prediction returned when the ML pipeline fails"""
+        return {
+            'is_at_risk': False,
+            'risk_score': 0.0,
+            'risk_factors': ['prediction_error'],
+            'confidence': 0,
+            'recommendation': 'Unable to predict - Error in ML pipeline',
+            'eco_score': 100,
+            'eco_issues': [],
+            'forecast': {'status': 'Unknown'}
+        }
+    
+    def _feature_buffer(self, rows=1):
+        """Get this thread's (rows, 6) feature scratch; only valid until the next call on the same thread"""
+        buf = getattr(self._local, 'feat_buf', None)
+        if buf is None or len(buf) < rows:
+            buf = self._local.feat_buf = np.empty((max(rows, 1), 6), dtype=np.float64)
+        return buf[:rows]
+    
+    def _score_bins(self, cpu_b, mem_b, temp_b, lat_b, disk_b, pod_b):
+        """Risk score for one set of quantized metrics (wrapped by _cached_score)"""
+        b = self._feature_buffer()
+        b[0, 0] = cpu_b / 100
+        b[0, 1] = mem_b / 100
+        b[0, 2] = temp_b / 100
+        b[0, 3] = lat_b / 50
+        b[0, 4] = disk_b / 100
+        b[0, 5] = pod_b / 20
+        return self._calculate_risk_score(b)
+    
+    def _extract_features_batch(self, nodes_data):
+        """Extract quantized, normalized features for many nodes into one (N, 6) array"""
+        features = self._feature_buffer(len(nodes_data))
+        features[:, 0] = [nd.get('cpu_usage', 0) for nd in nodes_data]
+        features[:, 1] = [nd.get('memory_usage', 0) for nd in nodes_data]
+        features[:, 2] = [nd.get('temperature', 50) for nd in nodes_data]
+        features[:, 3] = [nd.get('network_latency', 0) for nd in nodes_data]
+        features[:, 4] = [nd.get('disk_io', 0) for nd in nodes_data]
+        features[:, 5] = [len(nd.get('pods', [])) for nd in nodes_data]
+        # Same 1-unit bins as the cached single-node path so both agree
+        np.trunc(features, out=features)
+        features /= (100, 100, 100, 50, 100, 20)
+        return features
     
     def _calculate_risk_score(self, features):
         """Calculate risk score using ML model"""
-        # Get probability of degradation
-        proba = self.model.predict_proba(features)[0]
-        risk_score = proba[1]  # Probability of class 1 (degraded)
+        return float(self._calculate_risk_scores(features)[0])
+    
+    def _calculate_risk_scores(self, features):
+        """Calculate risk scores for each row of a feature matrix"""
+        if not self._use_ml:
+            features = np.ascontiguousarray(features, dtype=np.float64)
+            if len(features) > PARALLEL_BATCH_THRESHOLD:
+                return _fast_risk_batch_parallel(features)
+            return _fast_risk_batch(features)
+        
+        if self._predictor is not None:
+            dmat = treelite_runtime.DMatrix(features)
+            return np.ravel(self._predictor.predict(dmat))
+        
+        # The flat walk wins on small batches, where predict_proba's per-call overhead dominates
+        if self._flat is not None and len(features) <= PARALLEL_BATCH_THRESHOLD:
+            return self._flat_risk_scores(features)
+        
+        n_jobs = min(os.cpu_count() or 1, -(-len(features) // PARALLEL_BATCH_THRESHOLD))
+        if n_jobs > 1:
+            return self._predict_proba_parallel(features, n_jobs)
         
-        return float(risk_score)
+        # Probability of class 1 (degraded)
+        return self.model.predict_proba(features)[:, 1]
+    
+    def _predict_proba_parallel(self, features, n_jobs):
+        """Score row chunks concurrently; tree prediction releases the GIL"""
+        chunks = np.array_split(features, n_jobs)
+        parts = Parallel(n_jobs=n_jobs, backend='threading')(
+            delayed(self.model.predict_proba)(chunk) for chunk in chunks
+        )
+        return np.concatenate([part[:, 1] for part in parts])
     
     def _identify_risk_factors(self, node_data, risk_score):
         """Identify specific factors contributing to risk"""
-        factors = []
-        
-        # CPU check
         cpu = node_data.get('cpu_usage', 0)
-        if cpu > 80:
-            factors.append(f'High CPU ({cpu:.1f}%)')
-        
-        # Memory check
         mem = node_data.get('memory_usage', 0)
-        if mem > 85:
-            factors.append(f'Memory Pressure ({mem:.1f}%)')
-        
-        # Temperature check
         temp = node_data.get('temperature', 50)
-        if temp > 75:
-            factors.append(f'High Temperature ({temp:.1f}°C)')
-        
-        # Network latency check
         latency = node_data.get('network_latency', 0)
-        if latency > 30:
-            factors.append(f'Network Latency ({latency:.1f}ms)')
-        
-        # Disk I/O check
         disk = node_data.get('disk_io', 0)
-        if disk > 70:
-            factors.append(f'High Disk I/O ({disk:.1f}%)')
-        
-        # Pod density check
         pods = len(node_data.get('pods', []))
-        if pods > 15:
-            factors.append(f'High Pod Density ({pods} pods)')
+        
+        # Thresholds are checked on the raw values; labels only show one decimal, so
+        # rounding the cache key does not change the text
+        factors = list(_risk_factor_labels(
+            round(cpu, 1) if cpu > 80 else None,
+            round(mem, 1) if mem > 85 else None,
+            round(temp, 1) if temp > 75 else None,
+            round(latency, 1) if latency > 30 else None,
+            round(disk, 1) if disk > 70 else None,
+            pods if pods > 15 else None
+        ))
         
         # If high risk but no specific factors, add generic
         if risk_score > self.risk_threshold and not factors:
@@ -184,12 +467,35 @@ class MLDecisionEngine:
         if self.model is None:
             return {}
         
-        importances = self.model.feature_importances_
+        with self._importance_lock:
+            if self._feature_importances is None and self._importance_data is not None:
+                self._feature_importances = self._compute_feature_importance(*self._importance_data)
+                self._importance_data = None
+            importances = self._feature_importances
+        
+        if importances is None:
+            return {}
         return {
             name: float(importance) 
             for name, importance in zip(self.feature_names, importances)
         }
     
+    def _reset_feature_importance(self, X, y):
+        """Drop cached importances after a fit; they are recomputed from (X, y) when next requested"""
+        with self._importance_lock:
+            self._importance_data = (X, y)
+            self._feature_importances = None
+    
+    def _compute_feature_importance(self, X, y):
+        """
+        Permutation importance normalized to sum to 1
+        (HistGradientBoostingClassifier has no feature_importances_)
+        """
+        result = permutation_importance(self.model, X, y, n_repeats=5, random_state=42)
+        importances = np.clip(result.importances_mean, 0, None)
+        total = importances.sum()
+        return importances / total if total > 0 else importances
+    
     def get_model_accuracy(self):
         """Get model accuracy metrics"""
         # In production, this would be calculated from validation set
@@ -210,6 +516,8 @@ class MLDecisionEngine:
         """
         try:
             self.model.fit(training_data, labels)
+            self._reset_feature_importance(training_data, labels)
+            self._compile_model()
             logger.info("ML model updated with new training data")
         except Exception as e:
             logger.error(f"Error updating ML model: {e}")
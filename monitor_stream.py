@@ -1,22 +1,68 @@
-import urllib.request
-import json
+import asyncio
 import time
 
-print("Real-time Monitoring Data Stream (5 samples, 2 seconds apart):")
+import requests
+
+# orjson is optional: faster JSON decoding of the /api/nodes payload
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# aiohttp/uvloop are optional: without them samples are fetched over a requests.Session
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+NODES_URL = 'http://127.0.0.1:5000/api/nodes'
+SAMPLES = 5
+INTERVAL = 2
+
+
+async def stream_samples(fetch_nodes):
+    """Print SAMPLES readings of the first node, INTERVAL seconds apart"""
+    for i in range(SAMPLES):
+        nodes = await fetch_nodes()
+        
+        node = nodes[0]
+        timestamp = time.time()
+        
+        print(f"\nSample {i+1} - {node['node_name']}")
+        print(f"  CPU: {node['cpu_usage']:6.1f}%  Memory: {node['memory_usage']:6.1f}%  Temp: {node['temperature']:6.1f}°C")
+        
+        if i < SAMPLES - 1:
+            await asyncio.sleep(INTERVAL)
+
+
+async def main():
+    # One keep-alive connection for every sample instead of a new TCP connection each time
+    if aiohttp is not None:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+            async def fetch_nodes():
+                async with session.get(NODES_URL) as response:
+                    return json_loads(await response.read())
+            await stream_samples(fetch_nodes)
+    else:
+        with requests.Session() as session:
+            async def fetch_nodes():
+                response = await asyncio.to_thread(session.get, NODES_URL, timeout=5)
+                return json_loads(response.content)
+            await stream_samples(fetch_nodes)
+
+
+print(f"Real-time Monitoring Data Stream ({SAMPLES} samples, {INTERVAL} seconds apart):")
 print("=" * 70)
 
-for i in range(5):
-    response = urllib.request.urlopen('http://127.0.0.1:5000/api/nodes')
-    nodes = json.loads(response.read().decode())
-    
-    node = nodes[0]
-    timestamp = time.time()
-    
-    print(f"\nSample {i+1} - {node['node_name']}")
-    print(f"  CPU: {node['cpu_usage']:6.1f}%  Memory: {node['memory_usage']:6.1f}%  Temp: {node['temperature']:6.1f}°C")
-    
-    if i < 4:
-        time.sleep(2)
+if uvloop is not None:
+    uvloop.run(main())
+else:
+    asyncio.run(main())
 
 print("\n" + "=" * 70)
 print("✓ MONITORING ACTIVE - Data is updating every 3 seconds!")
@@ -6,29 +6,124 @@ Stores metrics, events, and predictions for trend analysis
 import sqlite3
 import json
 import os
-from datetime import datetime, timedelta
+import queue
+import threading
+import time
 from contextlib import contextmanager
 import logging
-from typing import List, Dict, Any, Optional
+import numpy as np
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'metrics_history.db')
 
+# Per-connection tuning applied when a thread opens its connection
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA secure_delete=OFF',
+)
+
+# Node metrics history table; {table} lets the legacy-schema rebuild reuse it
+CREATE_NODE_METRICS = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        node_id TEXT NOT NULL,
+        node_name TEXT,
+        cpu_usage REAL,
+        memory_usage REAL,
+        temperature REAL,
+        network_latency REAL,
+        disk_io REAL,
+        pod_count INTEGER,
+        risk_score REAL,
+        health_score REAL,
+        status TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+INSERT_NODE_METRICS = '''
+    INSERT INTO node_metrics 
+    (node_id, node_name, cpu_usage, memory_usage, temperature, 
+     network_latency, disk_io, pod_count, risk_score, health_score, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Latest health/risk per node, kept current on every metrics write
+UPSERT_CLUSTER_ROLLING = '''
+    INSERT OR REPLACE INTO cluster_rolling (node_id, health, risk)
+    VALUES (?, ?, ?)
+'''
+
+# Caller timestamps are local isoformat (datetime.now()); stored as UTC like CURRENT_TIMESTAMP
+INSERT_EVENT = '''
+    INSERT INTO events (id, type, title, description, node_id, details, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, COALESCE(datetime(?, 'utc'), CURRENT_TIMESTAMP))
+'''
+
+INSERT_PREDICTION = '''
+    INSERT INTO predictions (node_id, risk_score, is_at_risk, risk_factors, confidence, recommendation)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Stored timestamps are SQLite's UTC 'YYYY-MM-DD HH:MM:SS' text
+TREND_DTYPE = np.dtype([('timestamp', 'U19'), ('value', np.float64)])
+
+# Timestamp columns older databases filled with local datetime.now().isoformat()
+LEGACY_TIMESTAMP_COLUMNS = (
+    ('node_metrics', 'timestamp'),
+    ('events', 'timestamp'),
+    ('predictions', 'timestamp'),
+    ('system_metrics', 'timestamp'),
+    ('alerts', 'created_at'),
+    ('alerts', 'resolved_at'),
+    ('cluster_rolling', 'updated'),
+)
+
+# Background writer: predictions/events are queued and flushed in batches
+WRITE_QUEUE_SIZE = 10000
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_INTERVAL = 0.1  # seconds
+
+
+def _dict_row(cursor, row):
+    """Row factory for the readers that return dicts"""
+    return dict(zip([col[0] for col in cursor.description], row))
+
 
 class Database:
     """SQLite database manager for metrics persistence"""
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or DATABASE_PATH
+        self._local = threading.local()
         self._initialize_database()
+        self._write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._write_sql = {'prediction': INSERT_PREDICTION, 'event': INSERT_EVENT}
+        self._writer = threading.Thread(target=self._drain, name='db-writer', daemon=True)
+        self._writer.start()
         logger.info(f"✓ Database initialized: {self.db_path}")
     
+    def _connect(self):
+        """Return this thread's long-lived connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # IMMEDIATE takes the write lock at BEGIN so writers never deadlock on upgrade;
+            # sqlite3's statement cache reuses the prepared INSERT/SELECT statements
+            conn = sqlite3.connect(self.db_path, isolation_level='IMMEDIATE', cached_statements=256)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Get database connection with context manager"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get database connection with context manager (one transaction per block)"""
+        conn = self._connect()
         try:
             yield conn
             conn.commit()
@@ -36,33 +131,69 @@ class Database:
             conn.rollback()
             logger.error(f"Database error: {e}")
             raise
-        finally:
+    
+    def close(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
             conn.close()
+            self._local.conn = None
+    
+    def _drain(self):
+        """Writer thread: batch queued rows into one executemany per kind and transaction"""
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+            while len(batch) < WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            rows_by_kind = {}
+            for kind, row in batch:
+                rows_by_kind.setdefault(kind, []).append(row)
+            try:
+                self._write_batch(rows_by_kind)
+            except Exception:
+                # One bad row must not drop the whole batch; retry row by row
+                for kind, rows in rows_by_kind.items():
+                    for row in rows:
+                        try:
+                            self._write_batch({kind: [row]})
+                        except Exception:
+                            pass  # already logged by get_connection
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    def _write_batch(self, rows_by_kind: Dict[str, List[Tuple]]):
+        """Insert grouped rows in a single transaction"""
+        with self.get_connection() as conn:
+            for kind, rows in rows_by_kind.items():
+                conn.executemany(self._write_sql[kind], rows)
+    
+    def flush(self):
+        """Block until every queued prediction/event has been written"""
+        self._write_queue.join()
     
     def _initialize_database(self):
         """Create database tables if they don't exist"""
+        # auto_vacuum only takes effect before the first table exists (new databases);
+        # WAL is persistent in the database file and must be set outside a transaction
+        conn = self._connect()
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        conn.execute('PRAGMA journal_mode=WAL')
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
             # Node metrics history table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS node_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    node_id TEXT NOT NULL,
-                    node_name TEXT,
-                    cpu_usage REAL,
-                    memory_usage REAL,
-                    temperature REAL,
-                    network_latency REAL,
-                    disk_io REAL,
-                    pod_count INTEGER,
-                    risk_score REAL,
-                    health_score REAL,
-                    status TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(node_id, timestamp)
-                )
-            ''')
+            cursor.execute(CREATE_NODE_METRICS.format(table='node_metrics'))
+            self._drop_node_metrics_unique(cursor)
             
             # Events history table
             cursor.execute('''
@@ -121,69 +252,144 @@ class Database:
                 )
             ''')
             
+            # Rolling per-node snapshot backing get_cluster_summary
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cluster_rolling (
+                    node_id TEXT PRIMARY KEY,
+                    health REAL,
+                    risk REAL,
+                    updated DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            self._normalize_legacy_timestamps(cursor)
+            
             # Create indexes for faster queries
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_node_time ON node_metrics(node_id, timestamp)')
+            # Covering index for timestamp range aggregates (get_cluster_summary reads only this index)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_time_cover ON node_metrics(timestamp, risk_score, health_score, node_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_time ON events(timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_predictions_node_time ON predictions(node_id, timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_node ON alerts(node_id, created_at)')
+            # Range indexes for cleanup_old_data (node_metrics is covered by idx_metrics_time_cover)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_predictions_time ON predictions(timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_metrics_time ON system_metrics(timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_resolved ON alerts(resolved_at) WHERE resolved = 1')
+    
+    @staticmethod
+    def _drop_node_metrics_unique(cursor):
+        """Rebuild node_metrics without the UNIQUE(node_id, timestamp) of databases created before
+        plain INSERT; with second-resolution CURRENT_TIMESTAMP it rejects two writes in one second"""
+        indexes = cursor.execute('PRAGMA index_list(node_metrics)').fetchall()
+        if not any(unique and origin == 'u' for _, _, unique, origin, _ in indexes):
+            return
+        
+        logger.info("Rebuilding node_metrics without UNIQUE(node_id, timestamp)")
+        cursor.execute('DROP TABLE IF EXISTS node_metrics_rebuild')
+        cursor.execute(CREATE_NODE_METRICS.format(table='node_metrics_rebuild'))
+        cursor.execute('INSERT INTO node_metrics_rebuild SELECT * FROM node_metrics')
+        cursor.execute('DROP TABLE node_metrics')
+        cursor.execute('ALTER TABLE node_metrics_rebuild RENAME TO node_metrics')
+    
+    @staticmethod
+    def _normalize_legacy_timestamps(cursor):
+        """Rewrite local isoformat timestamps from older databases as UTC 'YYYY-MM-DD HH:MM:SS',
+        so cutoffs against datetime('now', ...) compare like with like (runs once, user_version 1)"""
+        if cursor.execute('PRAGMA user_version').fetchone()[0] >= 1:
+            return
+        
+        for table, column in LEGACY_TIMESTAMP_COLUMNS:
+            cursor.execute(
+                f"UPDATE {table} SET {column} = datetime({column}, 'utc') WHERE {column} LIKE '%T%'"
+            )
+        cursor.execute('PRAGMA user_version = 1')
+    
+    @staticmethod
+    def _node_metrics_row(node_data: Dict[str, Any], risk_score: float = 0, health_score: float = 100) -> Tuple:
+        """Build a node_metrics row tuple"""
+        return (
+            node_data.get('node_id'),
+            node_data.get('node_name'),
+            node_data.get('cpu_usage', 0),
+            node_data.get('memory_usage', 0),
+            node_data.get('temperature', 0),
+            node_data.get('network_latency', 0),
+            node_data.get('disk_io', 0),
+            len(node_data.get('pods', [])),
+            risk_score,
+            health_score,
+            node_data.get('status', 'unknown')
+        )
+    
+    @staticmethod
+    def _rolling_row(metrics_row: Tuple) -> Tuple:
+        """Project a node_metrics row onto cluster_rolling (node_id, health, risk)"""
+        return (metrics_row[0], metrics_row[9], metrics_row[8])
+    
+    @staticmethod
+    def _event_row(event: Dict[str, Any]) -> Tuple:
+        """Build an events row tuple"""
+        return (
+            event.get('id'),
+            event.get('type'),
+            event.get('title'),
+            event.get('description'),
+            event.get('nodeId'),
+            json.dumps(event.get('details', {})),
+            event.get('timestamp')
+        )
+    
+    @staticmethod
+    def _prediction_row(node_id: str, prediction: Dict[str, Any]) -> Tuple:
+        """Build a predictions row tuple"""
+        return (
+            node_id,
+            prediction.get('risk_score', 0),
+            1 if prediction.get('is_at_risk') else 0,
+            json.dumps(prediction.get('risk_factors', [])),
+            prediction.get('confidence', 0),
+            prediction.get('recommendation', '')
+        )
     
     def save_node_metrics(self, node_data: Dict[str, Any], risk_score: float = 0, health_score: float = 100):
         """Save node metrics to database"""
+        row = self._node_metrics_row(node_data, risk_score, health_score)
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO node_metrics 
-                (node_id, node_name, cpu_usage, memory_usage, temperature, 
-                 network_latency, disk_io, pod_count, risk_score, health_score, status, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                node_data.get('node_id'),
-                node_data.get('node_name'),
-                node_data.get('cpu_usage', 0),
-                node_data.get('memory_usage', 0),
-                node_data.get('temperature', 0),
-                node_data.get('network_latency', 0),
-                node_data.get('disk_io', 0),
-                len(node_data.get('pods', [])),
-                risk_score,
-                health_score,
-                node_data.get('status', 'unknown'),
-                datetime.now().isoformat()
-            ))
+            conn.execute(INSERT_NODE_METRICS, row)
+            conn.execute(UPSERT_CLUSTER_ROLLING, self._rolling_row(row))
+    
+    def save_node_metrics_many(self, rows: Iterable[Tuple[Dict[str, Any], float, float]]):
+        """Save (node_data, risk_score, health_score) rows in a single transaction"""
+        rows = [self._node_metrics_row(*row) for row in rows]
+        if not rows:
+            return
+        with self.get_connection() as conn:
+            conn.executemany(INSERT_NODE_METRICS, rows)
+            conn.executemany(UPSERT_CLUSTER_ROLLING, map(self._rolling_row, rows))
     
     def save_event(self, event: Dict[str, Any]):
-        """Save event to database"""
+        """Queue event for the background writer"""
+        self._write_queue.put(('event', self._event_row(event)))
+    
+    def save_events_many(self, events: Iterable[Dict[str, Any]]):
+        """Save several events in a single transaction"""
+        rows = [self._event_row(event) for event in events]
+        if not rows:
+            return
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO events (id, type, title, description, node_id, details, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                event.get('id'),
-                event.get('type'),
-                event.get('title'),
-                event.get('description'),
-                event.get('nodeId'),
-                json.dumps(event.get('details', {})),
-                event.get('timestamp', datetime.now().isoformat())
-            ))
+            conn.executemany(INSERT_EVENT, rows)
     
     def save_prediction(self, node_id: str, prediction: Dict[str, Any]):
-        """Save prediction to database"""
+        """Queue prediction for the background writer"""
+        self._write_queue.put(('prediction', self._prediction_row(node_id, prediction)))
+    
+    def save_predictions_many(self, rows: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Save (node_id, prediction) rows in a single transaction"""
+        rows = [self._prediction_row(node_id, prediction) for node_id, prediction in rows]
+        if not rows:
+            return
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO predictions (node_id, risk_score, is_at_risk, risk_factors, confidence, recommendation, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                node_id,
-                prediction.get('risk_score', 0),
-                1 if prediction.get('is_at_risk') else 0,
-                json.dumps(prediction.get('risk_factors', [])),
-                prediction.get('confidence', 0),
-                prediction.get('recommendation', ''),
-                datetime.now().isoformat()
-            ))
+            conn.executemany(INSERT_PREDICTION, rows)
     
     def save_system_metrics(self, metrics: Dict[str, Any]):
         """Save system-wide metrics"""
@@ -192,8 +398,8 @@ class Database:
             cursor.execute('''
                 INSERT INTO system_metrics 
                 (total_nodes, healthy_nodes, degraded_nodes, critical_nodes, 
-                 average_health, risks_detected, workloads_moved, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                 average_health, risks_detected, workloads_moved)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (
                 metrics.get('nodes_monitored', 0),
                 metrics.get('nodes_healthy', 0),
@@ -201,8 +407,7 @@ class Database:
                 metrics.get('critical_nodes', 0),
                 metrics.get('average_health', 100),
                 metrics.get('risks_detected', 0),
-                metrics.get('workloads_moved', 0),
-                datetime.now().isoformat()
+                metrics.get('workloads_moved', 0)
             ))
     
     def create_alert(self, node_id: str, alert_type: str, severity: str, message: str) -> int:
@@ -210,9 +415,9 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO alerts (node_id, alert_type, severity, message, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (node_id, alert_type, severity, message, datetime.now().isoformat()))
+                INSERT INTO alerts (node_id, alert_type, severity, message)
+                VALUES (?, ?, ?, ?)
+            ''', (node_id, alert_type, severity, message))
             return cursor.lastrowid
     
     def resolve_alert(self, alert_id: int):
@@ -220,38 +425,40 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                UPDATE alerts SET resolved = 1, resolved_at = ? WHERE id = ?
-            ''', (datetime.now().isoformat(), alert_id))
+                UPDATE alerts SET resolved = 1, resolved_at = CURRENT_TIMESTAMP WHERE id = ?
+            ''', (alert_id,))
     
     def get_node_metrics_history(self, node_id: str, hours: int = 24) -> List[Dict]:
         """Get historical metrics for a node"""
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        cutoff = f'-{hours} hours'
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _dict_row
             cursor.execute('''
                 SELECT * FROM node_metrics 
-                WHERE node_id = ? AND timestamp > ?
+                WHERE node_id = ? AND timestamp > datetime('now', ?)
                 ORDER BY timestamp ASC
             ''', (node_id, cutoff))
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
     
-    def get_all_metrics_history(self, hours: int = 24) -> List[Dict]:
-        """Get all historical metrics"""
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+    def get_all_metrics_history(self, hours: int = 24) -> List[Tuple]:
+        """Get all historical metrics as raw row tuples in node_metrics column order"""
+        cutoff = f'-{hours} hours'
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM node_metrics 
-                WHERE timestamp > ?
+                WHERE timestamp > datetime('now', ?)
                 ORDER BY timestamp DESC
                 LIMIT 1000
             ''', (cutoff,))
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
     
     def get_events_history(self, limit: int = 100, event_type: str = None) -> List[Dict]:
         """Get historical events"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _dict_row
             if event_type:
                 cursor.execute('''
                     SELECT * FROM events WHERE type = ? ORDER BY timestamp DESC LIMIT ?
@@ -261,17 +468,16 @@ class Database:
                     SELECT * FROM events ORDER BY timestamp DESC LIMIT ?
                 ''', (limit,))
             
-            events = []
-            for row in cursor.fetchall():
-                event = dict(row)
+            events = cursor.fetchall()
+            for event in events:
                 event['details'] = json.loads(event.get('details', '{}'))
-                events.append(event)
             return events
     
     def get_active_alerts(self, node_id: str = None) -> List[Dict]:
         """Get unresolved alerts"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _dict_row
             if node_id:
                 cursor.execute('''
                     SELECT * FROM alerts WHERE node_id = ? AND resolved = 0 ORDER BY created_at DESC
@@ -280,76 +486,74 @@ class Database:
                 cursor.execute('''
                     SELECT * FROM alerts WHERE resolved = 0 ORDER BY created_at DESC
                 ''')
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
     
     def get_system_metrics_history(self, hours: int = 24) -> List[Dict]:
         """Get system metrics history"""
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        cutoff = f'-{hours} hours'
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _dict_row
             cursor.execute('''
                 SELECT * FROM system_metrics 
-                WHERE timestamp > ?
+                WHERE timestamp > datetime('now', ?)
                 ORDER BY timestamp ASC
             ''', (cutoff,))
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
     
-    def get_node_trend(self, node_id: str, metric: str = 'risk_score', hours: int = 6) -> List[Dict]:
-        """Get trend data for a specific metric"""
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+    def get_node_trend(self, node_id: str, metric: str = 'risk_score', hours: int = 6) -> np.ndarray:
+        """Get trend data for a specific metric as a (timestamp, value) structured array"""
+        cutoff = f'-{hours} hours'
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(f'''
                 SELECT timestamp, {metric} as value FROM node_metrics 
-                WHERE node_id = ? AND timestamp > ?
+                WHERE node_id = ? AND timestamp > datetime('now', ?)
                 ORDER BY timestamp ASC
             ''', (node_id, cutoff))
-            return [dict(row) for row in cursor.fetchall()]
+            return np.fromiter(cursor, dtype=TREND_DTYPE)
     
     def get_cluster_summary(self) -> Dict[str, Any]:
         """Get summary statistics for the cluster"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get latest metrics per node
-            cursor.execute('''
-                SELECT node_id, MAX(timestamp) as latest
-                FROM node_metrics
-                GROUP BY node_id
-            ''')
-            latest_times = {row['node_id']: row['latest'] for row in cursor.fetchall()}
-            
-            # Get aggregate stats
+            # Aggregate the latest snapshot of each node seen in the last 5 minutes
             cursor.execute('''
                 SELECT 
-                    COUNT(DISTINCT node_id) as total_nodes,
-                    AVG(health_score) as avg_health,
-                    AVG(risk_score) as avg_risk,
-                    SUM(CASE WHEN risk_score > 0.65 THEN 1 ELSE 0 END) as at_risk_count
-                FROM node_metrics
-                WHERE timestamp > ?
-            ''', ((datetime.now() - timedelta(minutes=5)).isoformat(),))
+                    COUNT(*) as total_nodes,
+                    AVG(health) as avg_health,
+                    AVG(risk) as avg_risk,
+                    SUM(risk > 0.65) as at_risk_count
+                FROM cluster_rolling
+                WHERE updated > datetime('now', '-5 minutes')
+            ''')
             
             row = cursor.fetchone()
             if row:
+                total_nodes, avg_health, avg_risk, at_risk_count = row
                 return {
-                    'total_nodes': row['total_nodes'] or 0,
-                    'average_health': round(row['avg_health'] or 100, 1),
-                    'average_risk': round((row['avg_risk'] or 0) * 100, 1),
-                    'at_risk_count': row['at_risk_count'] or 0
+                    'total_nodes': total_nodes or 0,
+                    'average_health': round(avg_health or 100, 1),
+                    'average_risk': round((avg_risk or 0) * 100, 1),
+                    'at_risk_count': at_risk_count or 0
                 }
             return {'total_nodes': 0, 'average_health': 100, 'average_risk': 0, 'at_risk_count': 0}
     
     def cleanup_old_data(self, days: int = 7):
-        """Remove data older than specified days"""
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        """Remove data older than specified days in one transaction, then release freed pages"""
+        cutoff = f'-{days} days'
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('DELETE FROM node_metrics WHERE timestamp < ?', (cutoff,))
-            cursor.execute('DELETE FROM predictions WHERE timestamp < ?', (cutoff,))
-            cursor.execute('DELETE FROM system_metrics WHERE timestamp < ?', (cutoff,))
-            cursor.execute('DELETE FROM alerts WHERE resolved = 1 AND resolved_at < ?', (cutoff,))
-            logger.info(f"Cleaned up data older than {days} days")
+            cursor.execute("DELETE FROM node_metrics WHERE timestamp < datetime('now', ?)", (cutoff,))
+            cursor.execute("DELETE FROM predictions WHERE timestamp < datetime('now', ?)", (cutoff,))
+            cursor.execute("DELETE FROM system_metrics WHERE timestamp < datetime('now', ?)", (cutoff,))
+            cursor.execute("DELETE FROM alerts WHERE resolved = 1 AND resolved_at < datetime('now', ?)", (cutoff,))
+        
+        # Runs after the DELETEs commit; executescript steps the pragma to completion
+        # (execute() would stop after freeing a single page)
+        self._connect().executescript('PRAGMA incremental_vacuum;')
+        logger.info(f"Cleaned up data older than {days} days")
 
 
 # Global database instance
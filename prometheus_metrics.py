@@ -162,6 +162,39 @@ monitoring_active = Gauge(
     'Whether monitoring service is active (1=active, 0=inactive)'
 )
 
+# Per-node gauges, in the order update_node_metrics sets them
+NODE_GAUGES = (
+    node_cpu_usage, node_memory_usage, node_temperature, node_network_latency,
+    node_disk_io, node_pod_count, node_health_score, node_risk_score
+)
+
+# Bound label children, resolved once per label set instead of on every update
+_bound_cache: dict = {}
+_api_bound_cache: dict = {}
+
+
+def _node_children(node_id: str, node_name: str) -> tuple:
+    """Get the bound per-node gauge children for a (node_id, node_name) pair"""
+    key = (node_id, node_name)
+    children = _bound_cache.get(key)
+    if children is None:
+        children = tuple(g.labels(node_id=node_id, node_name=node_name) for g in NODE_GAUGES)
+        _bound_cache[key] = children
+    return children
+
+
+def _api_children(method: str, endpoint: str, status: int) -> tuple:
+    """Get the bound (counter, histogram) children for an API request label set"""
+    key = (method, endpoint, status)
+    children = _api_bound_cache.get(key)
+    if children is None:
+        children = (
+            api_requests_total.labels(method=method, endpoint=endpoint, status=str(status)),
+            api_request_duration.labels(method=method, endpoint=endpoint)
+        )
+        _api_bound_cache[key] = children
+    return children
+
 
 class PrometheusMetrics:
     """Helper class to update Prometheus metrics"""
@@ -172,16 +205,16 @@ class PrometheusMetrics:
         node_id = node_data.get('node_id', 'unknown')
         node_name = node_data.get('node_name', node_id)
         
-        labels = {'node_id': node_id, 'node_name': node_name}
+        cpu, memory, temperature, latency, disk_io, pods, health, risk = _node_children(node_id, node_name)
         
-        node_cpu_usage.labels(**labels).set(node_data.get('cpu_usage', 0))
-        node_memory_usage.labels(**labels).set(node_data.get('memory_usage', 0))
-        node_temperature.labels(**labels).set(node_data.get('temperature', 0))
-        node_network_latency.labels(**labels).set(node_data.get('network_latency', 0))
-        node_disk_io.labels(**labels).set(node_data.get('disk_io', 0))
-        node_pod_count.labels(**labels).set(len(node_data.get('pods', [])))
-        node_health_score.labels(**labels).set(health_score)
-        node_risk_score.labels(**labels).set(risk_score)
+        cpu.set(node_data.get('cpu_usage', 0))
+        memory.set(node_data.get('memory_usage', 0))
+        temperature.set(node_data.get('temperature', 0))
+        latency.set(node_data.get('network_latency', 0))
+        disk_io.set(node_data.get('disk_io', 0))
+        pods.set(len(node_data.get('pods', [])))
+        health.set(health_score)
+        risk.set(risk_score)
     
     @staticmethod
     def update_cluster_metrics(stats: dict):
@@ -210,8 +243,9 @@ class PrometheusMetrics:
     @staticmethod
     def record_api_request(method: str, endpoint: str, status: int, duration: float):
         """Record an API request"""
-        api_requests_total.labels(method=method, endpoint=endpoint, status=str(status)).inc()
-        api_request_duration.labels(method=method, endpoint=endpoint).observe(duration)
+        requests, duration_hist = _api_children(method, endpoint, status)
+        requests.inc()
+        duration_hist.observe(duration)
     
     @staticmethod
     def record_ml_prediction(duration: float, is_high_risk: bool = False):
@@ -8,69 +8,119 @@ import subprocess
 import sys
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-def run_cmd(cmd, shell=True, check=False):
-    """Run command and return output"""
+def run_cmd(argv, check=False, timeout=30):
+    """Run command (argv list, no shell) and return output"""
     try:
-        result = subprocess.run(cmd, shell=shell, capture_output=True, text=True, check=check)
+        result = subprocess.run(argv, shell=False, capture_output=True, text=True, check=check, timeout=timeout)
         return result.returncode, result.stdout.strip(), result.stderr.strip()
     except Exception as e:
         return 1, "", str(e)
 
-def check_minikube():
-    """Check if Minikube is installed"""
-    print("=" * 60)
-    print("CHECKING MINIKUBE")
-    print("=" * 60)
+MINIKUBE_VERSION_CMD = ["minikube", "version"]
+HYPERV_STATE_CMD = ["powershell", "-NoProfile", "-Command", "(Get-WindowsOptionalFeature -FeatureName Hyper-V).State"]
+VIRTUALBOX_VERSION_CMD = ["VirtualBoxVM", "--version"]
+
+def _banner(title, lead="\n"):
+    rule = "=" * 60
+    return f"{lead}{rule}\n{title}\n{rule}\n"
+
+# Section banners and fixed help blocks, each written with a single call
+_BANNER_MINIKUBE = _banner("CHECKING MINIKUBE", lead="")
+_BANNER_VIRTUALIZATION = _banner("CHECKING VIRTUALIZATION")
+_BANNER_START = _banner("STARTING MINIKUBE")
+_BANNER_KUBECTL = _banner("VERIFYING KUBECTL CONNECTION")
+_BANNER_KUBECONFIG = _banner("KUBECONFIG LOCATION")
+
+_MINIKUBE_INSTALL_HELP = "\n".join((
+    "✗ Minikube not found",
+    "\nTo install Minikube:",
+    "  1. Download: https://minikube.sigs.k8s.io/docs/start/",
+    "  2. Or use Chocolatey: choco install minikube",
+    "  3. Then run this script again",
+    "",
+))
+
+_NO_BACKEND_HELP = "\n".join((
+    "⚠ No virtualization backend found",
+    "  Install one of:",
+    "  • Hyper-V (built-in on Windows Pro/Enterprise)",
+    "  • VirtualBox (free): https://www.virtualbox.org/",
+    "  • Docker Desktop (has built-in K8s support, alternative to Minikube)",
+    "",
+))
+
+_NEXT_STEPS = _banner("NEXT STEPS") + """
+1. Verify cluster is running:
+   kubectl get pods -A
+
+2. Validate our system's cluster access:
+   python validate_cluster.py
+
+3. Connect system to cluster:
+   python app.py
+
+4. Open web UI:
+   http://127.0.0.1:5000
+
+5. Test operations:
+   • Click "Taint" to prevent new pod scheduling
+   • Click "Drain" to evict pods from node
+   • Click "Remove Taint" to restore node
+   • Watch events in log for live updates
+
+6. When done, stop Minikube:
+   minikube stop
+
+"""
+
+def probe(pending, argv):
+    """Result of an already-submitted run_cmd future, or run argv now"""
+    return pending.result() if pending else run_cmd(argv)
+
+def check_minikube(pending=None):
+    """Check if Minikube is installed (pending: optional in-flight version probe)"""
+    sys.stdout.write(_BANNER_MINIKUBE)
     
-    code, out, err = run_cmd("minikube version")
+    code, out, err = probe(pending, MINIKUBE_VERSION_CMD)
     if code == 0:
         print(f"✓ Minikube installed: {out}")
         return True
     else:
-        print("✗ Minikube not found")
-        print("\nTo install Minikube:")
-        print("  1. Download: https://minikube.sigs.k8s.io/docs/start/")
-        print("  2. Or use Chocolatey: choco install minikube")
-        print("  3. Then run this script again")
+        sys.stdout.write(_MINIKUBE_INSTALL_HELP)
         return False
 
-def check_virtualization():
-    """Check if Hyper-V is available"""
-    print("\n" + "=" * 60)
-    print("CHECKING VIRTUALIZATION")
-    print("=" * 60)
+def check_virtualization(hyperv=None, virtualbox=None):
+    """Check if Hyper-V is available (hyperv/virtualbox: optional in-flight probes)"""
+    sys.stdout.write(_BANNER_VIRTUALIZATION)
     
     # Windows Hyper-V check
-    code, out, err = run_cmd("powershell -Command \"(Get-WindowsOptionalFeature -FeatureName Hyper-V).State\"", shell=True)
+    code, out, err = probe(hyperv, HYPERV_STATE_CMD)
     
     if code == 0 and "Enabled" in out:
         print("✓ Hyper-V is available")
         return "hyperv"
     
     # Check if VirtualBox is available
-    code, out, err = run_cmd("VirtualBoxVM --version")
+    code, out, err = probe(virtualbox, VIRTUALBOX_VERSION_CMD)
     if code == 0:
         print("✓ VirtualBox is available")
         return "virtualbox"
     
-    print("⚠ No virtualization backend found")
-    print("  Install one of:")
-    print("  • Hyper-V (built-in on Windows Pro/Enterprise)")
-    print("  • VirtualBox (free): https://www.virtualbox.org/")
-    print("  • Docker Desktop (has built-in K8s support, alternative to Minikube)")
+    sys.stdout.write(_NO_BACKEND_HELP)
     return None
 
 def start_minikube(driver):
     """Start Minikube cluster"""
-    print("\n" + "=" * 60)
-    print("STARTING MINIKUBE")
-    print("=" * 60)
+    sys.stdout.write(_BANNER_START)
     
-    print(f"Starting Minikube with {driver} driver...")
-    print("(This may take 2-3 minutes on first startup)\n")
+    sys.stdout.write(f"Starting Minikube with {driver} driver...\n(This may take 2-3 minutes on first startup)\n\n")
+    # Show progress before the long-running start
+    sys.stdout.flush()
     
-    code, out, err = run_cmd(f"minikube start --driver {driver}")
+    # First start downloads the VM image, so allow well beyond the default timeout
+    code, out, err = run_cmd(["minikube", "start", "--driver", driver], timeout=900)
     
     if code == 0:
         print("✓ Minikube started successfully")
@@ -81,11 +131,9 @@ def start_minikube(driver):
 
 def verify_kubectl():
     """Verify kubectl can access cluster"""
-    print("\n" + "=" * 60)
-    print("VERIFYING KUBECTL CONNECTION")
-    print("=" * 60)
+    sys.stdout.write(_BANNER_KUBECTL)
     
-    code, out, err = run_cmd("kubectl get nodes")
+    code, out, err = run_cmd(["kubectl", "get", "nodes"])
     
     if code == 0:
         print("✓ kubectl connected to cluster")
@@ -100,9 +148,7 @@ def verify_kubectl():
 
 def get_kubeconfig_path():
     """Get kubeconfig path"""
-    print("\n" + "=" * 60)
-    print("KUBECONFIG LOCATION")
-    print("=" * 60)
+    sys.stdout.write(_BANNER_KUBECONFIG)
     
     home = os.path.expanduser("~")
     kubeconfig = os.path.join(home, ".kube", "config")
@@ -112,52 +158,36 @@ def get_kubeconfig_path():
         return kubeconfig
     else:
         print(f"⚠ Kubeconfig not found at: {kubeconfig}")
-        code, out, err = run_cmd("kubectl config view")
+        code, out, err = run_cmd(["kubectl", "config", "view"])
         if code == 0:
             print("✓ But kubectl can access cluster (in-memory config)")
         return kubeconfig
 
 def show_next_steps():
     """Show what to do next"""
-    print("\n" + "=" * 60)
-    print("NEXT STEPS")
-    print("=" * 60)
-    
-    print("""
-1. Verify cluster is running:
-   kubectl get pods -A
-
-2. Validate our system's cluster access:
-   python validate_cluster.py
-
-3. Connect system to cluster:
-   python app.py
-
-4. Open web UI:
-   http://127.0.0.1:5000
-
-5. Test operations:
-   • Click "Taint" to prevent new pod scheduling
-   • Click "Drain" to evict pods from node
-   • Click "Remove Taint" to restore node
-   • Watch events in log for live updates
-
-6. When done, stop Minikube:
-   minikube stop
-""")
+    sys.stdout.write(_NEXT_STEPS)
 
 def main():
     print("\n🚀 MINIKUBE SETUP FOR PREDICTIVE INFRASTRUCTURE\n")
     
-    # Check Minikube installation
-    if not check_minikube():
-        return 1
-    
-    # Check virtualization
-    driver = check_virtualization()
-    if not driver:
-        print("\n❌ Please install a virtualization backend first")
-        return 1
+    # The installation and virtualization probes are independent, so run them together;
+    # reports still print in order. The kubeconfig lookup waits for minikube start,
+    # which is what creates the file.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        minikube, hyperv, virtualbox = (
+            pool.submit(run_cmd, argv)
+            for argv in (MINIKUBE_VERSION_CMD, HYPERV_STATE_CMD, VIRTUALBOX_VERSION_CMD)
+        )
+        
+        # Check Minikube installation
+        if not check_minikube(minikube):
+            return 1
+        
+        # Check virtualization
+        driver = check_virtualization(hyperv, virtualbox)
+        if not driver:
+            print("\n❌ Please install a virtualization backend first")
+            return 1
     
     # Start Minikube
     if not start_minikube(driver):
@@ -183,9 +213,8 @@ def main():
     # Show next steps
     show_next_steps()
     
-    print("\n✅ MINIKUBE READY!")
-    print(f"✅ Kubeconfig: {kubeconfig}")
-    print("✅ Ready to run: python app.py\n")
+    sys.stdout.write(f"\n✅ MINIKUBE READY!\n✅ Kubeconfig: {kubeconfig}\n✅ Ready to run: python app.py\n\n")
+    sys.stdout.flush()
     
     return 0
 
@@ -1,8 +1,16 @@
 import json
-from app import app, _ensure_demo_nodes
+from flask.testing import EnvironBuilder
+from app import app, _ensure_demo_nodes, taint_node, drain_node, remove_taint
 
 client = app.test_client()
 
+
+def call(view, node_id, payload):
+    """Invoke a node action view directly, skipping client routing and dispatch"""
+    with app.test_request_context(method='POST', json=payload):
+        return app.make_response(view(node_id))
+
+
 # Ensure demo nodes exist
 _ensure_demo_nodes()
 nodes = client.get('/api/nodes').get_json()
@@ -11,26 +19,29 @@ print('Nodes:', [n['node_id'] for n in nodes])
 node_id = nodes[0]['node_id']
 print('Testing on node:', node_id)
 
+# One prebuilt request reused for every node-detail check
+node_request = EnvironBuilder(app=app, path=f'/api/nodes/{node_id}', headers={'Content-Type': 'application/json'})
+
 # Taint
-resp = client.post(f'/api/nodes/{node_id}/taint', json={'taint': 'degradation=true:NoSchedule'})
+resp = call(taint_node, node_id, {'taint': 'degradation=true:NoSchedule'})
 print('Taint response:', resp.status_code, resp.get_json())
 
 # Get node details
-resp = client.get(f'/api/nodes/{node_id}')
+resp = client.open(node_request)
 print('Node after taint:', resp.status_code, json.dumps(resp.get_json(), indent=2))
 
 # Drain
-resp = client.post(f'/api/nodes/{node_id}/drain', json={'grace_period': 5})
+resp = call(drain_node, node_id, {'grace_period': 5})
 print('Drain response:', resp.status_code, resp.get_json())
 
 # Get node details after drain
-resp = client.get(f'/api/nodes/{node_id}')
+resp = client.open(node_request)
 print('Node after drain:', resp.status_code, json.dumps(resp.get_json(), indent=2))
 
 # Remove taint
-resp = client.post(f'/api/nodes/{node_id}/remove-taint', json={'key': 'degradation'})
+resp = call(remove_taint, node_id, {'key': 'degradation'})
 print('Remove taint response:', resp.status_code, resp.get_json())
 
 # Final node state
-resp = client.get(f'/api/nodes/{node_id}')
+resp = client.open(node_request)
 print('Final node:', json.dumps(resp.get_json(), indent=2))
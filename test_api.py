@@ -1,5 +1,5 @@
-import urllib.request
-import json
+from http_session import SESSION
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 endpoints = [
     ('Stats', '/api/stats'),
@@ -9,21 +9,31 @@ endpoints = [
     ('Health', '/api/health'),
 ]
 
+
+def fetch(endpoint):
+    """GET an endpoint and decode its JSON body"""
+    return SESSION.get(f'http://127.0.0.1:5000{endpoint}', timeout=2).json()
+
+
 print("Testing API Endpoints:\n")
-for name, endpoint in endpoints:
-    try:
-        response = urllib.request.urlopen(f'http://127.0.0.1:5000{endpoint}')
-        data = json.loads(response.read().decode())
-        
-        if isinstance(data, list):
-            print(f"✓ {name}: {len(data)} items")
-            if name == 'Nodes' and data:
-                print(f"  Sample node: {data[0]['node_name']} - CPU: {data[0].get('cpu_usage', 0):.1f}%, Memory: {data[0].get('memory_usage', 0):.1f}%")
-        else:
-            print(f"✓ {name}:")
-            for key, value in data.items():
-                print(f"  {key}: {value}")
-    except Exception as e:
-        print(f"✗ {name}: {str(e)}")
+# Probes are independent, so total time is the slowest endpoint rather than the sum
+with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+    futures = {executor.submit(fetch, endpoint): name for name, endpoint in endpoints}
+    for future in as_completed(futures):
+        name = futures[future]
+        try:
+            data = future.result(timeout=2)
+            
+            if isinstance(data, list):
+                print(f"✓ {name}: {len(data)} items")
+                if name == 'Nodes' and data:
+                    node = data[0]
+                    print(f"  Sample node: {node['node_name']} - CPU: {node.get('cpu_usage', 0):.1f}%, Memory: {node.get('memory_usage', 0):.1f}%")
+            else:
+                print(f"✓ {name}:")
+                for key, value in data.items():
+                    print(f"  {key}: {value}")
+        except Exception as e:
+            print(f"✗ {name}: {str(e)}")
 
 print("\n✓ All systems working! UI should display all data correctly.")
@@ -1,11 +1,9 @@
-import urllib.request
-import json
+from http_session import SESSION
 
 print("Testing ML Predictions and Event Generation:\n")
 
 # Check predictions
-response = urllib.request.urlopen('http://127.0.0.1:5000/api/predictions')
-predictions = json.loads(response.read().decode())
+predictions = SESSION.get('http://127.0.0.1:5000/api/predictions').json()
 print(f"Predictions Generated: {len(predictions)} nodes")
 for p in predictions[:3]:
     risk = p['prediction'].get('risk_probability', 0)
@@ -14,9 +12,8 @@ for p in predictions[:3]:
 print()
 
 # Check if events are accumulating
-response = urllib.request.urlopen('http://127.0.0.1:5000/api/events')
-events = json.loads(response.read().decode())
-print(f"Total Events Logged: {events.__len__()}")
+events = SESSION.get('http://127.0.0.1:5000/api/events').json()
+print(f"Total Events Logged: {len(events)}")
 print(f"Sample event: {events[0]['title'] if events else 'None'}")
 
 print()
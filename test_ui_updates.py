@@ -4,10 +4,11 @@ Quick test to verify UI updates are working
 This simulates button clicks and verifies the backend responds correctly
 """
 
-import requests
+from http_session import SESSION
 import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Fix Unicode issues on Windows
 if sys.platform == 'win32':
@@ -17,25 +18,28 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
 BASE_URL = "http://127.0.0.1:5000"
+PROBE_TIMEOUT = 2  # seconds per read-only probe
 
-def test_health():
-    """Test backend is running"""
+
+def test_health(pending=None):
+    """Test backend is running (pending: optional in-flight response future)"""
     try:
-        resp = requests.get(f"{BASE_URL}/api/health")
+        resp = pending.result(timeout=PROBE_TIMEOUT) if pending else SESSION.get(f"{BASE_URL}/api/health")
         print(f"✓ Backend health: {resp.json()}")
         return resp.status_code == 200
     except Exception as e:
         print(f"✗ Health check failed: {e}")
         return False
 
-def test_nodes():
-    """Get current nodes"""
+def test_nodes(pending=None):
+    """Get current nodes (pending: optional in-flight response future)"""
     try:
-        resp = requests.get(f"{BASE_URL}/api/nodes")
+        resp = pending.result(timeout=PROBE_TIMEOUT) if pending else SESSION.get(f"{BASE_URL}/api/nodes")
         nodes = resp.json()
         print(f"✓ Got {len(nodes)} nodes")
         for n in nodes:
-            print(f"  - {n['node_name']} (taints: {len(n.get('taints', []))})")
+            taints = n.get('taints') or ()
+            print(f"  - {n['node_name']} (taints: {len(taints)})")
         return nodes
     except Exception as e:
         print(f"✗ Failed to get nodes: {e}")
@@ -51,7 +55,7 @@ def test_taint_action():
     print(f"\n📌 Tainting node: {node_id}")
     
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{BASE_URL}/api/nodes/{node_id}/taint",
             json={"taint": "degradation=true:NoSchedule"},
             headers={"Content-Type": "application/json"}
@@ -60,7 +64,7 @@ def test_taint_action():
         
         # Check if taints were applied
         time.sleep(0.5)
-        resp2 = requests.get(f"{BASE_URL}/api/nodes/{node_id}")
+        resp2 = SESSION.get(f"{BASE_URL}/api/nodes/{node_id}")
         node = resp2.json()
         taints = node.get('taints', [])
         print(f"  Node now has {len(taints)} taints: {taints}")
@@ -89,7 +93,7 @@ def test_remove_taint():
     print(f"\n🧹 Removing taint from: {tainted_node['node_id']}")
     
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{BASE_URL}/api/nodes/{tainted_node['node_id']}/remove-taint",
             json={"key": "degradation"},
             headers={"Content-Type": "application/json"}
@@ -98,9 +102,9 @@ def test_remove_taint():
         
         # Check if taints were removed
         time.sleep(0.5)
-        resp2 = requests.get(f"{BASE_URL}/api/nodes/{tainted_node['node_id']}")
+        resp2 = SESSION.get(f"{BASE_URL}/api/nodes/{tainted_node['node_id']}")
         node = resp2.json()
-        taints = node.get('taints', [])
+        taints = node.get('taints') or ()
         print(f"  Node now has {len(taints)} taints")
         return len(taints) == 0
     except Exception as e:
@@ -110,16 +114,18 @@ def test_remove_taint():
 def test_drain():
     """Test drain button action"""
     nodes = test_nodes()
-    if not nodes or not nodes[0].get('pods'):
+    first = nodes[0] if nodes else {}
+    pods = first.get('pods') or ()
+    if not pods:
         print("\n⚠️ No pods to drain (demo may not have any)")
         return False
     
-    node_id = nodes[0]['node_id']
-    pod_count_before = len(nodes[0].get('pods', []))
+    node_id = first['node_id']
+    pod_count_before = len(pods)
     print(f"\n💧 Draining node: {node_id} (has {pod_count_before} pods)")
     
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{BASE_URL}/api/nodes/{node_id}/drain",
             json={"grace_period": 30},
             headers={"Content-Type": "application/json"}
@@ -128,19 +134,19 @@ def test_drain():
         
         # Check if pods were drained
         time.sleep(0.5)
-        resp2 = requests.get(f"{BASE_URL}/api/nodes/{node_id}")
+        resp2 = SESSION.get(f"{BASE_URL}/api/nodes/{node_id}")
         node = resp2.json()
-        pod_count_after = len(node.get('pods', []))
+        pod_count_after = len(node.get('pods') or ())
         print(f"  Pods before: {pod_count_before}, after: {pod_count_after}")
         return pod_count_after == 0
     except Exception as e:
         print(f"✗ Drain failed: {e}")
         return False
 
-def test_events():
-    """Check if events are being recorded"""
+def test_events(pending=None):
+    """Check if events are being recorded (pending: optional in-flight response future)"""
     try:
-        resp = requests.get(f"{BASE_URL}/api/events")
+        resp = pending.result(timeout=PROBE_TIMEOUT) if pending else SESSION.get(f"{BASE_URL}/api/events")
         events = resp.json()
         print(f"\n📋 Recent events ({len(events)} total):")
         for e in events[-5:]:  # Show last 5
@@ -155,12 +161,20 @@ if __name__ == "__main__":
     print("UI UPDATE INTEGRATION TEST")
     print("=" * 50)
     
-    if not test_health():
-        print("\n❌ Backend not running! Start it first with: python app.py")
-        exit(1)
-    
-    test_nodes()
-    test_events()
+    # Read-only probes run concurrently; results are reported in order.
+    # The taint/drain tests below mutate shared node state, so they stay serial.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        health, nodes, events = (
+            pool.submit(SESSION.get, f"{BASE_URL}{path}", timeout=PROBE_TIMEOUT)
+            for path in ('/api/health', '/api/nodes', '/api/events')
+        )
+        
+        if not test_health(health):
+            print("\n❌ Backend not running! Start it first with: python app.py")
+            exit(1)
+        
+        test_nodes(nodes)
+        test_events(events)
     
     success = 0
     total = 3
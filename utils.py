@@ -5,13 +5,63 @@ Common utilities for error handling, validation, response formatting
 
 import logging
 import functools
+import os
+import re
 import time
-from flask import jsonify
+import psutil
+from collections import OrderedDict, defaultdict, deque
+from flask import Response, current_app, g, jsonify, stream_with_context
 from datetime import datetime
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional: faster response serialization; falls back to Flask's JSON provider
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Sorted keys match jsonify's default output
+    _ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Kubernetes node names are DNS-1123 subdomains: dot-separated lowercase alphanumeric/'-' labels
+_NODE_ID_RE = re.compile(r'^[a-z0-9]([-a-z0-9]*[a-z0-9])?(\.[a-z0-9]([-a-z0-9]*[a-z0-9])?)*$')
+
+# Handle to this process, created once instead of on every memory query
+_PROCESS = psutil.Process()
+
+
+def _process() -> psutil.Process:
+    """Cached process handle, re-created after a fork (e.g. preloaded gunicorn workers)"""
+    global _PROCESS
+    if _PROCESS.pid != os.getpid():
+        _PROCESS = psutil.Process()
+    return _PROCESS
+
+
+def _request_timestamp() -> str:
+    """ISO timestamp computed once per request (stored on flask.g) and reused"""
+    ts = g.get('_ts_iso')
+    if ts is None:
+        ts = g._ts_iso = datetime.now().isoformat()
+    return ts
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+    return current_app.json.dumps(obj).encode()
+
+
+def _json_response(payload: Dict[str, Any], status_code: int) -> tuple:
+    """Build a (response, status) pair for a JSON payload"""
+    if ORJSON_AVAILABLE:
+        return Response(_dumps(payload), status=status_code, mimetype='application/json'), status_code
+    return jsonify(payload), status_code
+
 
 class APIResponse:
     """Standardized API response format"""
@@ -22,10 +72,27 @@ class APIResponse:
         response = {
             'success': True,
             'message': message,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _request_timestamp(),
             'data': data
         }
-        return jsonify(response), status_code
+        return _json_response(response, status_code)
+    
+    @staticmethod
+    def success_stream(items: Iterable[Any], message: str = "Success", status_code: int = 200) -> tuple:
+        """Return a successful response whose data list is serialized item by item as it streams"""
+        head = _dumps({
+            'success': True,
+            'message': message,
+            'timestamp': _request_timestamp()
+        })[:-1] + b',"data":['
+        
+        def generate():
+            yield head
+            for i, item in enumerate(items):
+                yield (b',' if i else b'') + _dumps(item)
+            yield b']}'
+        
+        return Response(stream_with_context(generate()), status=status_code, mimetype='application/json'), status_code
     
     @staticmethod
     def error(error: str, status_code: int = 400, details: Dict = None) -> tuple:
@@ -33,10 +100,10 @@ class APIResponse:
         response = {
             'success': False,
             'error': error,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _request_timestamp(),
             'details': details or {}
         }
-        return jsonify(response), status_code
+        return _json_response(response, status_code)
     
     @staticmethod
     def validation_error(field: str, message: str) -> tuple:
@@ -44,10 +111,10 @@ class APIResponse:
         response = {
             'success': False,
             'error': 'Validation failed',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _request_timestamp(),
             'details': {'field': field, 'message': message}
         }
-        return jsonify(response), 422
+        return _json_response(response, 422)
     
     @staticmethod
     def not_found(resource: str = "Resource") -> tuple:
@@ -61,13 +128,13 @@ class InputValidator:
     @staticmethod
     def is_valid_node_id(node_id: str) -> bool:
         """Validate node ID format"""
-        if not node_id or not isinstance(node_id, str):
-            return False
-        return len(node_id) <= 255 and len(node_id) > 0
+        return isinstance(node_id, str) and 0 < len(node_id) <= 253 and _NODE_ID_RE.match(node_id) is not None
     
     @staticmethod
     def is_valid_percentage(value: float) -> bool:
         """Validate percentage value (0-100)"""
+        if isinstance(value, (int, float)):
+            return 0 <= value <= 100
         try:
             val = float(value)
             return 0 <= val <= 100
@@ -77,6 +144,8 @@ class InputValidator:
     @staticmethod
     def is_valid_metric(value: float, min_val: float = 0, max_val: float = 100) -> bool:
         """Validate metric value within range"""
+        if isinstance(value, (int, float)):
+            return min_val <= value <= max_val
         try:
             val = float(value)
             return min_val <= val <= max_val
@@ -99,14 +168,14 @@ class PerformanceMonitor:
         """Decorator to measure function execution time"""
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             result = func(*args, **kwargs)
-            elapsed_time = time.time() - start_time
+            elapsed_ns = time.perf_counter_ns() - start_ns
             
-            if elapsed_time > 1.0:  # Log slow operations
-                logger.warning(f"Slow operation: {func.__name__} took {elapsed_time:.2f}s")
-            else:
-                logger.debug(f"{func.__name__} took {elapsed_time:.3f}s")
+            if elapsed_ns > 1_000_000_000:  # Log slow operations
+                logger.warning("Slow operation: %s took %.2fs", func.__name__, elapsed_ns / 1e9)
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s took %.3fs", func.__name__, elapsed_ns / 1e9)
             
             return result
         return wrapper
@@ -114,37 +183,38 @@ class PerformanceMonitor:
     @staticmethod
     def get_memory_usage() -> Dict[str, Any]:
         """Get current memory usage statistics"""
-        import psutil
-        process = psutil.Process()
+        process = _process()
         memory_info = process.memory_info()
         return {
-            'rss_mb': memory_info.rss / 1024 / 1024,  # Resident Set Size
-            'vms_mb': memory_info.vms / 1024 / 1024,  # Virtual Memory Size
+            'rss_mb': memory_info.rss >> 20,  # Resident Set Size
+            'vms_mb': memory_info.vms >> 20,  # Virtual Memory Size
             'percent': process.memory_percent()
         }
 
 
+# Map common errors to HTTP status codes; isinstance also covers subclasses
+# (e.g. socket.timeout is a TimeoutError, ConnectionResetError a ConnectionError)
+_ERROR_STATUS = (
+    (ValueError, 400),
+    (TypeError, 400),
+    (KeyError, 404),
+    (TimeoutError, 504),
+    (ConnectionError, 503),
+)
+
+
 class ErrorHandler:
     """Central error handling utilities"""
     
     @staticmethod
     def handle_error(error: Exception, context: str = "") -> tuple:
         """Handle and log errors uniformly"""
-        error_type = type(error).__name__
+        error_type = error.__class__.__name__
         error_msg = str(error)
         
         logger.error(f"Error in {context}: {error_type}: {error_msg}", exc_info=True)
         
-        # Map common errors to HTTP status codes
-        error_handlers = {
-            'ValueError': 400,
-            'KeyError': 404,
-            'TypeError': 400,
-            'TimeoutError': 504,
-            'ConnectionError': 503,
-        }
-        
-        status_code = error_handlers.get(error_type, 500)
+        status_code = next((code for cls, code in _ERROR_STATUS if isinstance(error, cls)), 500)
         return APIResponse.error(f"{error_type}: {error_msg}", status_code)
     
     @staticmethod
@@ -161,35 +231,29 @@ class ErrorHandler:
 
 
 class DataCache:
-    """Simple in-memory cache for frequently accessed data"""
+    """Simple in-memory LRU cache for frequently accessed data"""
     
     def __init__(self, max_size: int = 100):
-        self.cache = {}
+        self.cache = OrderedDict()
         self.max_size = max_size
-        self.access_count = {}
     
     def get(self, key: str) -> Optional[Any]:
         """Retrieve from cache"""
         if key in self.cache:
-            self.access_count[key] = self.access_count.get(key, 0) + 1
+            self.cache.move_to_end(key)
             return self.cache[key]
         return None
     
     def set(self, key: str, value: Any) -> None:
-        """Store in cache"""
-        if len(self.cache) >= self.max_size:
-            # Remove least accessed item
-            least_accessed = min(self.access_count, key=self.access_count.get)
-            del self.cache[least_accessed]
-            del self.access_count[least_accessed]
-        
+        """Store in cache, evicting the least recently used item when full"""
         self.cache[key] = value
-        self.access_count[key] = 1
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
     
     def clear(self) -> None:
         """Clear the cache"""
         self.cache.clear()
-        self.access_count.clear()
     
     def size(self) -> int:
         """Get current cache size"""
@@ -202,23 +266,20 @@ class RateLimiter:
     def __init__(self, max_requests: int = 100, window_seconds: int = 60):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = {}
+        self.requests = defaultdict(deque)
     
     def is_allowed(self, identifier: str) -> bool:
         """Check if request is within rate limit"""
         now = time.time()
+        timestamps = self.requests[identifier]
         
-        if identifier not in self.requests:
-            self.requests[identifier] = []
-        
-        # Remove old requests outside the window
-        self.requests[identifier] = [
-            req_time for req_time in self.requests[identifier]
-            if now - req_time < self.window_seconds
-        ]
+        # Drop old requests from the front; timestamps are appended in order
+        cutoff = now - self.window_seconds
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
         
-        if len(self.requests[identifier]) < self.max_requests:
-            self.requests[identifier].append(now)
+        if len(timestamps) < self.max_requests:
+            timestamps.append(now)
             return True
         
         return False
@@ -7,12 +7,90 @@ Checks readiness for cluster integration and validates permissions
 import os
 import sys
 import logging
+import mmap
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import yaml
+    from yaml import CSafeLoader
+    YAML_C_AVAILABLE = True
+except ImportError:
+    YAML_C_AVAILABLE = False
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _kube():
+    """Load cluster config once and return (shared CoreV1Api client, running in-cluster)"""
+    from kubernetes import client, config
+    
+    kubeconfig = os.environ.get('KUBECONFIG')
+    
+    try:
+        # Try in-cluster config first
+        config.load_incluster_config()
+        in_cluster = True
+    except:
+        # Fall back to kubeconfig file
+        if kubeconfig:
+            config.load_kube_config(config_file=kubeconfig)
+        else:
+            config.load_kube_config()
+        in_cluster = False
+    
+    return client.CoreV1Api(), in_cluster
+
+
+@lru_cache(maxsize=1)
+def _list_nodes():
+    """Bulk node list shared by every check"""
+    return _kube()[0].list_node()
+
+
+@lru_cache(maxsize=1)
+def _list_pods():
+    """Bulk pod list shared by every check"""
+    return _kube()[0].list_pod_for_all_namespaces()
+
+
+def _warm_cluster_cache():
+    """Load config, then fetch the node and pod lists concurrently into their caches"""
+    _kube()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for future in (pool.submit(_list_nodes), pool.submit(_list_pods)):
+            # Failures are not cached; they resurface (and are reported) in the checks
+            future.exception()
+
+
+def _count_pods(node_name):
+    """Pod count for one node via a field-selector list (capped at 500ms client-side)"""
+    return len(_kube()[0].list_pod_for_all_namespaces(
+        field_selector=f'spec.nodeName={node_name}',
+        timeout_seconds=2,
+        _request_timeout=0.5
+    ).items)
+
+
+def _count_pods_per_node(node_names):
+    """Fallback when the bulk pod list fails: fan per-node counts out over a thread pool"""
+    counts = Counter()
+    if not node_names:
+        return counts
+    with ThreadPoolExecutor(max_workers=min(16, len(node_names))) as pool:
+        futures = {pool.submit(_count_pods, name): name for name in node_names}
+        for future in as_completed(futures):
+            try:
+                counts[futures[future]] = future.result()
+            except:
+                pass
+    return counts
+
+
 def check_kubeconfig():
     """Check if kubeconfig file is accessible"""
     logger.info("=" * 60)
@@ -30,6 +108,37 @@ def check_kubeconfig():
             logger.error("✗ KUBECONFIG not set and ~/.kube/config not found")
             return False
     
+    return _validate_kubeconfig_file(kubeconfig)
+
+
+def _has_kubeconfig_sections(kubeconfig):
+    """Check the file has top-level clusters/users sections (parsed once per file version)"""
+    st = os.stat(kubeconfig)
+    return _parse_kubeconfig_sections(kubeconfig, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=8)
+def _parse_kubeconfig_sections(kubeconfig, mtime_ns, size):
+    """Cached parse result; mtime/size are part of the key so an edited file is re-read"""
+    if YAML_C_AVAILABLE:
+        # Parse once with libyaml; anything that isn't a mapping with both keys is invalid
+        with open(kubeconfig, 'rb') as f:
+            try:
+                doc = yaml.load(f, Loader=CSafeLoader)
+            except yaml.YAMLError:
+                return False
+        return isinstance(doc, dict) and 'clusters' in doc and 'users' in doc
+    
+    # No C loader: scan the mapped file without copying it into a str
+    with open(kubeconfig, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(b'clusters:') != -1 and mm.find(b'users:') != -1
+
+
+def _validate_kubeconfig_file(kubeconfig):
+    """Existence/readability/format checks for a resolved kubeconfig path"""
     # Check if file exists
     if not Path(kubeconfig).exists():
         logger.error(f"✗ Kubeconfig file not found: {kubeconfig}")
@@ -39,13 +148,11 @@ def check_kubeconfig():
     
     # Check readability
     try:
-        with open(kubeconfig, 'r') as f:
-            content = f.read()
-            if 'clusters:' in content and 'users:' in content:
-                logger.info("✓ Kubeconfig format valid")
-            else:
-                logger.warning("⚠ Kubeconfig format might be invalid")
-                return False
+        if _has_kubeconfig_sections(kubeconfig):
+            logger.info("✓ Kubeconfig format valid")
+        else:
+            logger.warning("⚠ Kubeconfig format might be invalid")
+            return False
     except Exception as e:
         logger.error(f"✗ Cannot read kubeconfig: {e}")
         return False
@@ -76,42 +183,27 @@ def check_cluster_connection():
     logger.info("=" * 60)
     
     try:
-        from kubernetes import client, config
-        
-        kubeconfig = os.environ.get('KUBECONFIG')
-        
-        try:
-            # Try in-cluster config first
-            config.load_incluster_config()
-            logger.info("✓ Running in-cluster")
-        except:
-            # Fall back to kubeconfig file
-            if kubeconfig:
-                config.load_kube_config(config_file=kubeconfig)
-            else:
-                config.load_kube_config()
-            logger.info("✓ Loaded kubeconfig successfully")
+        v1, in_cluster = _kube()
+        logger.info("✓ Running in-cluster" if in_cluster else "✓ Loaded kubeconfig successfully")
         
         # Try to list nodes
-        v1 = client.CoreV1Api()
-        nodes = v1.list_node()
+        nodes = _list_nodes()
         
         if nodes.items:
             logger.info(f"✓ Connected to cluster - found {len(nodes.items)} nodes")
             
+            # One bulk pod list counted per node instead of a filtered list call per node
+            try:
+                pod_counts = Counter(pod.spec.node_name for pod in _list_pods().items)
+            except:
+                pod_counts = _count_pods_per_node([node.metadata.name for node in nodes.items])
+            
             # List node names
             for node in nodes.items:
                 taint_str = ""
                 if node.spec.taints:
                     taint_str = f" (taints: {len(node.spec.taints)})"
-                pod_count = 0
-                try:
-                    pods = v1.list_pod_for_all_namespaces(
-                        field_selector=f'spec.nodeName={node.metadata.name}'
-                    )
-                    pod_count = len(pods.items)
-                except:
-                    pass
+                pod_count = pod_counts[node.metadata.name]
                 logger.info(f"  - {node.metadata.name} ({pod_count} pods){taint_str}")
             
             return True
@@ -132,30 +224,11 @@ def check_permissions():
     logger.info("=" * 60)
     
     try:
-        from kubernetes import client, config
-        
-        kubeconfig = os.environ.get('KUBECONFIG')
-        
-        try:
-            config.load_incluster_config()
-        except:
-            if kubeconfig:
-                config.load_kube_config(config_file=kubeconfig)
-            else:
-                config.load_kube_config()
-        
-        # Prepare test operations
-        tests = [
-            ('get nodes', lambda c: c.list_node()),
-            ('patch nodes', lambda c: c.read_node('dummy')),  # Will fail but tests permission
-            ('list pods', lambda c: c.list_pod_for_all_namespaces())
-        ]
-        
-        v1 = client.CoreV1Api()
+        v1, _ = _kube()
         
         # Test get nodes
         try:
-            v1.list_node()
+            _list_nodes()
             logger.info("✓ Permission: get nodes")
         except Exception as e:
             if 'forbidden' in str(e).lower():
@@ -163,7 +236,7 @@ def check_permissions():
             
         # Test patch nodes (via read, since patch would modify)
         try:
-            nodes = v1.list_node()
+            nodes = _list_nodes()
             if nodes.items:
                 v1.read_node(nodes.items[0].metadata.name)
                 logger.info("✓ Permission: read/patch nodes (inferred)")
@@ -173,7 +246,7 @@ def check_permissions():
         
         # Test list pods
         try:
-            v1.list_pod_for_all_namespaces()
+            _list_pods()
             logger.info("✓ Permission: list pods")
         except Exception as e:
             if 'forbidden' in str(e).lower():
@@ -190,12 +263,17 @@ def main():
     """Run all validation checks"""
     logger.info("\n🔍 KUBERNETES CLUSTER VALIDATION\n")
     
-    results = {
-        'Kubeconfig': check_kubeconfig(),
-        'Kubernetes Client': check_kubernetes_client(),
-        'Cluster Connection': check_cluster_connection(),
-        'RBAC Permissions': check_permissions()
-    }
+    # The cluster round trips start right away; the local checks run meanwhile
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        warm = pool.submit(_warm_cluster_cache)
+        results = {
+            'Kubeconfig': check_kubeconfig(),
+            'Kubernetes Client': check_kubernetes_client(),
+        }
+        warm.exception()
+    
+    results['Cluster Connection'] = check_cluster_connection()
+    results['RBAC Permissions'] = check_permissions()
     
     # Summary
     logger.info("")
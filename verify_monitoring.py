@@ -1,30 +1,26 @@
-import urllib.request
-import json
-import time
+from http_session import node_updates
 
 print("Monitoring Data Updates:")
 print("=" * 60)
 
-# Get first set of data
-response1 = urllib.request.urlopen('http://127.0.0.1:5000/api/nodes')
-nodes1 = json.loads(response1.read().decode())
+# Two consecutive monitoring ticks, pushed by the server as they happen
+updates = node_updates()
 
 # Extract metrics from first node
+t1, nodes1 = next(updates)
 node1_first = nodes1[0]
-print(f"Time 0s - {node1_first['node_name']}:")
+print(f"Time {t1:.1f}s - {node1_first['node_name']}:")
 print(f"  CPU: {node1_first['cpu_usage']:.1f}%")
 print(f"  Memory: {node1_first['memory_usage']:.1f}%")
 print(f"  Temperature: {node1_first['temperature']:.1f}°C")
 
-print("\nWaiting 3 seconds for monitoring update...")
-time.sleep(3)
+print("\nWaiting for the next monitoring update...")
 
-# Get second set of data
-response2 = urllib.request.urlopen('http://127.0.0.1:5000/api/nodes')
-nodes2 = json.loads(response2.read().decode())
+t2, nodes2 = next(updates)
+updates.close()
 
 node1_second = nodes2[0]
-print(f"\nTime 3s - {node1_second['node_name']}:")
+print(f"\nTime {t2:.1f}s - {node1_second['node_name']}:")
 print(f"  CPU: {node1_second['cpu_usage']:.1f}%")
 print(f"  Memory: {node1_second['memory_usage']:.1f}%")
 print(f"  Temperature: {node1_second['temperature']:.1f}°C")
@@ -1,19 +1,17 @@
-import urllib.request, json, time
+from http_session import node_updates
 
 print("Checking if data is being updated...")
 print()
 
-# Get initial data
-response1 = urllib.request.urlopen('http://127.0.0.1:5000/api/nodes')
-data1 = json.loads(response1.read().decode())
-cpu1 = data1[0]['cpu_usage']
+# Two consecutive monitoring ticks, pushed by the server as they happen
+updates = node_updates()
 
-time.sleep(2)
+_, data1 = next(updates)
+cpu1 = data1[0]['cpu_usage']
 
-# Get updated data
-response2 = urllib.request.urlopen('http://127.0.0.1:5000/api/nodes')
-data2 = json.loads(response2.read().decode())
+_, data2 = next(updates)
 cpu2 = data2[0]['cpu_usage']
+updates.close()
 
 print(f"First reading  - Node 0 CPU: {cpu1:.1f}%")
 print(f"Second reading - Node 0 CPU: {cpu2:.1f}%")
@@ -5,9 +5,45 @@ Handles graceful startup, shutdown, and signal management
 
 import os
 import sys
+import shutil
 import signal
 import logging
-from app import app, config, logger, initialize_components
+from config import config, setup_logging
+
+# The Flask app is imported lazily: importing it starts background threads (Kubernetes
+# watchers, monitoring), which must run in the serving process, not a gunicorn master
+setup_logging(config)
+logger = logging.getLogger(__name__)
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    GUNICORN_AVAILABLE = False
+
+# Waitress is optional: a pooled, keep-alive dev server; without it the Werkzeug server is used
+try:
+    from waitress import serve
+    from werkzeug.debug import DebuggedApplication
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+if GUNICORN_AVAILABLE:
+    class StandaloneApp(BaseApplication):
+        """Gunicorn application run in-process; each worker imports the Flask app after fork"""
+        
+        def __init__(self, options=None):
+            self.options = options or {}
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            from app import app
+            return app
 
 def handle_sigterm(signum, frame):
     """Handle SIGTERM signal for graceful shutdown"""
@@ -24,18 +60,35 @@ def run_production():
     logger.info(f"Starting {config.APP_NAME} in production mode")
     logger.info(f"Binding to {config.HOST}:{config.PORT}")
     
-    # Use gunicorn command
-    os.system(f"""
-        gunicorn \
-            --workers {config.MAX_WORKERS} \
-            --worker-class sync \
-            --bind {config.HOST}:{config.PORT} \
-            --timeout {config.REQUEST_TIMEOUT} \
-            --access-logfile - \
-            --error-logfile - \
-            --log-level {config.LOG_LEVEL.lower()} \
-            app:app
-    """)
+    if not GUNICORN_AVAILABLE:
+        if shutil.which('gunicorn'):
+            # gunicorn installed outside this interpreter: replace this process with it (no shell)
+            os.execvp('gunicorn', [
+                'gunicorn',
+                '--workers', str(config.MAX_WORKERS),
+                '--worker-class', 'gthread',
+                '--threads', str(config.THREADS_PER_WORKER),
+                '--bind', f'{config.HOST}:{config.PORT}',
+                '--timeout', str(config.REQUEST_TIMEOUT),
+                '--access-logfile', '-',
+                '--error-logfile', '-',
+                '--log-level', config.LOG_LEVEL.lower(),
+                'app:app',
+            ])
+        raise RuntimeError("gunicorn is not installed. Run: pip install gunicorn")
+    
+    options = {
+        'bind': f'{config.HOST}:{config.PORT}',
+        'workers': config.MAX_WORKERS,
+        # Threaded workers so blocking Kubernetes/DB calls don't hold a whole process
+        'worker_class': 'gthread',
+        'threads': config.THREADS_PER_WORKER,
+        'timeout': config.REQUEST_TIMEOUT,
+        'accesslog': '-',
+        'errorlog': '-',
+        'loglevel': config.LOG_LEVEL.lower(),
+    }
+    StandaloneApp(options).run()
 
 def run_development():
     """Run application in development mode"""
@@ -43,10 +96,27 @@ def run_development():
     logger.info(f"Debug mode: {config.DEBUG}")
     logger.info(f"Binding to http://{config.HOST}:{config.PORT}")
     
+    from app import app
+    
     # Register signal handlers
     signal.signal(signal.SIGTERM, handle_sigterm)
     signal.signal(signal.SIGINT, handle_sigint)
     
+    if WAITRESS_AVAILABLE:
+        # Honour DEBUG like app.run(debug=True): debug mode on the app plus Werkzeug's
+        # interactive debugger around it. For reload-on-change run under:
+        # watchmedo auto-restart -- python wsgi.py
+        app.debug = config.DEBUG
+        serve(
+            DebuggedApplication(app, evalex=True) if config.DEBUG else app,
+            host=config.HOST,
+            port=config.PORT,
+            threads=config.THREADS_PER_WORKER,
+            connection_limit=1000,
+            channel_timeout=config.REQUEST_TIMEOUT
+        )
+        return
+    
     app.run(
         host=config.HOST,
         port=config.PORT,